@@ -1,18 +1,57 @@
+import asyncio
+import re
+from contextlib import asynccontextmanager
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Set, Tuple
+from functools import lru_cache
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
 
-from fastapi import FastAPI, Query
+from async_lru import alru_cache
+from fastapi import FastAPI, Query, Response
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy import text
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import RowMapping, TextClause, text
+from sqlalchemy.ext.asyncio import AsyncConnection
 
 from config.settings import get_settings
-from scripts.models import get_engine
-from api.snapshot import generate_snapshot_safe
-
-app = FastAPI(title="ETL Portfólio API", version="1.0.0")
+from scripts.models import get_async_engine
+from api.snapshot import (
+    _STATUS_LABEL_SQL,
+    _STATUS_MAP,
+    _STATUS_ORDEM_SQL,
+    generate_snapshot_safe,
+)
 
 settings = get_settings()
-engine = get_engine()
+engine = get_async_engine()
+# Leituras em AUTOCOMMIT: sem BEGIN/ROLLBACK implícitos a cada checkout do pool
+read_engine = engine.execution_options(isolation_level="AUTOCOMMIT")
+
+
+async def _snapshot_loop(limit: int, interval_min: int) -> None:
+    # Gera o snapshot fora do event loop; com intervalo > 0 mantém o mock.json atualizado
+    while True:
+        await asyncio.to_thread(generate_snapshot_safe, limit=limit)
+        if interval_min <= 0:
+            return
+        await asyncio.sleep(interval_min * 60)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    limit = getattr(settings, "api_snapshot_limit", 5000)
+    interval_min = getattr(settings, "api_snapshot_interval_min", 0)
+    task = asyncio.create_task(_snapshot_loop(limit, interval_min))
+    yield
+    task.cancel()
+    await engine.dispose()
+
+
+app = FastAPI(
+    title="ETL Portfólio API",
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
 
 
 def _parse_origins(origins_raw: str) -> List[str]:
@@ -21,35 +60,50 @@ def _parse_origins(origins_raw: str) -> List[str]:
 
 
 origins = _parse_origins(getattr(settings, "api_cors_origins", "http://localhost:5173"))
+if not origins and getattr(settings, "api_env", "dev") == "prod":
+    raise RuntimeError("API_CORS_ORIGINS deve ser definido em produção")
 
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins or ["*"],
-    allow_credentials=True,
+    # "*" com credenciais é inválido pela especificação CORS e o navegador rejeita
+    allow_credentials=bool(origins),
     allow_methods=["*"],
     allow_headers=["*"],
 )
 
 
-@app.on_event("startup")
-def _startup_snapshot() -> None:
-    limit = getattr(settings, "api_snapshot_limit", 5000)
-    generate_snapshot_safe(limit=limit)
+# Campos ignorados por _build_filters, combinados em bits (ex.: _SKIP_ANO | _SKIP_MES)
+_SKIP_ANO = 1 << 0
+_SKIP_MES = 1 << 1
+_SKIP_CATEGORIA = 1 << 2
+_SKIP_STATUS = 1 << 3
+_SKIP_PRODUTO = 1 << 4
+_SKIP_BUSCA = 1 << 5
+
+# (chave do filtro, coluna de origem, bit de skip) na ordem das listas de /filtros.
+# /filtros e /agregados/* leem das materialized views (sql/materialized_views.sql),
+# atualizadas ao final de cada execução do ETL.
+_FILTROS_COLUNAS = (
+    ("ano", "ano_transacao", _SKIP_ANO),
+    ("mes", "mes_transacao", _SKIP_MES),
+    ("categoria", "categoria", _SKIP_CATEGORIA),
+    ("status", "status_pagamento", _SKIP_STATUS),
+    ("produto", "produto", _SKIP_PRODUTO),
+)
 
+# Status conhecidos viram literais no SQL (o planner usa as estatísticas do valor)
+_STATUS_CLAUSES = {
+    "pago": "status_pagamento = 'PAGO'",
+    "pendente": "status_pagamento = 'PENDENTE'",
+    "erro": "status_pagamento = 'ERRO'",
+    "cancelado": "status_pagamento = 'CANCELADO'",
+    "atrasado": "status_pagamento = 'ATRASADO'",
+}
 
-def _map_status_display(status_db: str) -> str:
-    status_upper = (status_db or "").strip().upper()
-    if status_upper == "PAGO":
-        return "Pago"
-    if status_upper == "PENDENTE":
-        return "Pendente"
-    if status_upper == "CANCELADO":
-        return "Cancelado"
-    if status_upper == "ATRASADO":
-        return "Atrasado"
-    if status_upper == "ERRO":
-        return "Erro"
-    return "Erro"
+_BUSCA_FULLTEXT = getattr(settings, "api_busca_fulltext", True)
+# Só palavras entram na tsquery; operadores (& | ! : ( )) digitados são descartados
+_BUSCA_TERMO_RE = re.compile(r"\w+")
 
 
 def _build_filters(
@@ -59,44 +113,47 @@ def _build_filters(
     status: Optional[str],
     produto: Optional[str],
     busca: Optional[str] = None,
-    skip_fields: Optional[Set[str]] = None,
+    skip: int = 0,
+    prefix: str = "",
 ) -> Tuple[str, Dict[str, Any]]:
+    # Caminho rápido: carga inicial do dashboard e /transacoes/total chegam sem filtros
+    if ano is None and mes is None and not (categoria or status or produto or busca):
+        return "", {}
+
     clauses = []
     params: Dict[str, Any] = {}
-    skip_fields = skip_fields or set()
-
-    if ano is not None and "ano" not in skip_fields:
-        clauses.append("ano_transacao = :ano")
-        params["ano"] = ano
-    if mes is not None and "mes" not in skip_fields:
-        clauses.append("mes_transacao = :mes")
-        params["mes"] = mes
-    if categoria and "categoria" not in skip_fields:
-        clauses.append("categoria = :categoria")
-        params["categoria"] = categoria
-    if status and "status" not in skip_fields:
-        status_norm = status.strip().lower()
-        if status_norm == "pago":
-            clauses.append("status_pagamento = 'PAGO'")
-        elif status_norm == "pendente":
-            clauses.append("status_pagamento = 'PENDENTE'")
-        elif status_norm == "erro":
-            clauses.append("status_pagamento = 'ERRO'")
-        elif status_norm == "cancelado":
-            clauses.append("status_pagamento = 'CANCELADO'")
-        elif status_norm == "atrasado":
-            clauses.append("status_pagamento = 'ATRASADO'")
+
+    if ano is not None and not skip & _SKIP_ANO:
+        clauses.append(f"ano_transacao = :{prefix}ano")
+        params[f"{prefix}ano"] = ano
+    if mes is not None and not skip & _SKIP_MES:
+        clauses.append(f"mes_transacao = :{prefix}mes")
+        params[f"{prefix}mes"] = mes
+    if categoria and not skip & _SKIP_CATEGORIA:
+        clauses.append(f"categoria = :{prefix}categoria")
+        params[f"{prefix}categoria"] = categoria
+    if status and not skip & _SKIP_STATUS:
+        status_clause = _STATUS_CLAUSES.get(status.strip().lower())
+        if status_clause:
+            clauses.append(status_clause)
         else:
-            clauses.append("status_pagamento = :status")
-            params["status"] = status
-    if produto and "produto" not in skip_fields:
-        clauses.append("produto = :produto")
-        params["produto"] = produto
-    if busca and busca.strip() and "busca" not in skip_fields:
-        clauses.append(
-            "(cliente ILIKE :busca OR produto ILIKE :busca OR categoria ILIKE :busca)"
-        )
-        params["busca"] = f"%{busca.strip()}%"
+            clauses.append(f"status_pagamento = :{prefix}status")
+            params[f"{prefix}status"] = status
+    if produto and not skip & _SKIP_PRODUTO:
+        clauses.append(f"produto = :{prefix}produto")
+        params[f"{prefix}produto"] = produto
+    if busca and busca.strip() and not skip & _SKIP_BUSCA:
+        # Full-text no índice GIN de search_doc: cada palavra vira um prefixo (termo:*)
+        termos = _BUSCA_TERMO_RE.findall(busca) if _BUSCA_FULLTEXT else []
+        if termos:
+            clauses.append(f"search_doc @@ to_tsquery('simple', :{prefix}busca)")
+            params[f"{prefix}busca"] = " & ".join(f"{termo}:*" for termo in termos)
+        else:
+            clauses.append(
+                f"(cliente ILIKE :{prefix}busca OR produto ILIKE :{prefix}busca "
+                f"OR categoria ILIKE :{prefix}busca)"
+            )
+            params[f"{prefix}busca"] = f"%{busca.strip()}%"
 
     where_sql = f"WHERE {' AND '.join(clauses)}" if clauses else ""
     return where_sql, params
@@ -110,38 +167,35 @@ def _combine_where(base_where: str, extra_clause: str) -> str:
     return f"WHERE {extra_clause}"
 
 
-def _fetch_metricas(where_sql: str, params: Dict[str, Any]) -> Dict[str, Any]:
+async def _fetch_metricas(where_sql: str, params: Dict[str, Any]) -> Dict[str, Any]:
     sql = f"""
         SELECT
             COUNT(*)::int AS quantidade_transacoes,
             COALESCE(SUM(valor), 0)::float AS valor_total,
             COALESCE(AVG(valor), 0)::float AS ticket_medio,
-            COALESCE(SUM(CASE WHEN status_pagamento = 'PAGO' THEN 1 ELSE 0 END), 0)::int
-                AS quantidade_pagas,
+            COUNT(*) FILTER (WHERE status_pagamento = 'PAGO')::int AS quantidade_pagas,
             COALESCE(
                 ROUND(
-                    100.0 * SUM(CASE WHEN status_pagamento = 'PAGO' THEN 1 ELSE 0 END)
+                    100.0 * COUNT(*) FILTER (WHERE status_pagamento = 'PAGO')
                     / NULLIF(COUNT(*), 0)::numeric,
                     2
                 ),
                 0
             )::float AS percentual_pagas,
+            COALESCE(AVG(dias_processamento), 0)::float AS tempo_medio_processamento,
             COALESCE(
-                AVG(EXTRACT(EPOCH FROM (data_processamento - data_transacao)) / 86400.0),
-                0
-            )::float AS tempo_medio_processamento,
-            COALESCE(
-                AVG(EXTRACT(EPOCH FROM (data_pagamento - data_transacao)) / 86400.0)
+                AVG(dias_pagamento)
                     FILTER (WHERE data_pagamento IS NOT NULL),
                 0
             )::float AS tempo_medio_pagamento
         FROM transacoes
         {where_sql}
     """
-    return _fetch_one(sql, params)
+    rows = await _fetch_cached(sql, params)
+    return rows[0] if rows else {}
 
 
-def _resolve_periodo_atual(
+async def _resolve_periodo_atual(
     ano: Optional[int],
     mes: Optional[int],
     categoria: Optional[str],
@@ -150,7 +204,7 @@ def _resolve_periodo_atual(
     busca: Optional[str],
 ) -> Optional[Dict[str, Any]]:
     base_where, base_params = _build_filters(
-        None, None, categoria, status, produto, busca, skip_fields={"ano", "mes"}
+        None, None, categoria, status, produto, busca, skip=_SKIP_ANO | _SKIP_MES
     )
 
     if ano and mes:
@@ -158,19 +212,28 @@ def _resolve_periodo_atual(
     if ano and not mes:
         return {"tipo": "ano", "ano": ano}
 
-    if mes and not ano:
-        where_mes = _combine_where(base_where, "mes_transacao = :mes")
-        params = dict(base_params)
-        params["mes"] = mes
-        max_ano = _fetch_one(
-            f"SELECT MAX(ano_transacao) AS ano FROM transacoes {where_mes}", params
-        ).get("ano")
-        if max_ano:
-            return {"tipo": "mes", "ano": int(max_ano), "mes": mes}
-
-    max_date = _fetch_one(
-        f"SELECT MAX(data_transacao) AS max_data FROM transacoes {base_where}", base_params
-    ).get("max_data")
+    async with read_engine.connect() as conn:
+        if mes and not ano:
+            where_mes = _combine_where(base_where, "mes_transacao = :mes")
+            params = dict(base_params)
+            params["mes"] = mes
+            max_ano = (
+                await _fetch_one(
+                    f"SELECT MAX(ano_transacao) AS ano FROM transacoes {where_mes}",
+                    params,
+                    conn=conn,
+                )
+            ).get("ano")
+            if max_ano:
+                return {"tipo": "mes", "ano": int(max_ano), "mes": mes}
+
+        max_date = (
+            await _fetch_one(
+                f"SELECT MAX(data_transacao) AS max_data FROM transacoes {base_where}",
+                base_params,
+                conn=conn,
+            )
+        ).get("max_data")
     if not max_date:
         return None
 
@@ -195,93 +258,105 @@ def _periodo_label(periodo: Dict[str, Any]) -> str:
     return "vs mês anterior" if periodo.get("tipo") == "mes" else "vs ano anterior"
 
 
-def _fetch_all(sql: str, params: Dict[str, Any]) -> List[Dict[str, Any]]:
-    with engine.connect() as conn:
-        result = conn.execute(text(sql), params).mappings().all()
-    return [dict(row) for row in result]
+@lru_cache(maxsize=256)
+def _compiled(sql: str) -> TextClause:
+    # _build_filters gera sempre o mesmo SQL para o mesmo conjunto de filtros ativos
+    # (os valores vão nos bind params), então o texto identifica o formato da consulta.
+    return text(sql)
 
 
-def _fetch_one(sql: str, params: Dict[str, Any]) -> Dict[str, Any]:
-    with engine.connect() as conn:
-        result = conn.execute(text(sql), params).mappings().first()
+async def _fetch_all(
+    sql: str, params: Dict[str, Any], conn: Optional[AsyncConnection] = None
+) -> Sequence[RowMapping]:
+    # Devolve os RowMapping sem copiar para dict; quem precisa alterar a linha
+    # (ex.: rótulo de status) materializa o dict no próprio endpoint.
+    # Endpoints com várias consultas passam a mesma conexão em conn.
+    if conn is not None:
+        return (await conn.execute(_compiled(sql), params)).mappings().all()
+    async with read_engine.connect() as conn:
+        return (await conn.execute(_compiled(sql), params)).mappings().all()
+
+
+async def _fetch_one(
+    sql: str, params: Dict[str, Any], conn: Optional[AsyncConnection] = None
+) -> Dict[str, Any]:
+    if conn is not None:
+        result = (await conn.execute(_compiled(sql), params)).mappings().first()
+    else:
+        async with read_engine.connect() as conn:
+            result = (await conn.execute(_compiled(sql), params)).mappings().first()
     return dict(result) if result else {}
 
 
+@alru_cache(maxsize=512, ttl=getattr(settings, "api_cache_ttl_seconds", 30))
+async def _fetch_all_cached(
+    sql: str, params_key: Tuple[Tuple[str, Any], ...]
+) -> Tuple[RowMapping, ...]:
+    return tuple(await _fetch_all(sql, dict(params_key)))
+
+
+async def _fetch_cached(sql: str, params: Dict[str, Any]) -> List[RowMapping]:
+    # Cache curto por (SQL, parâmetros) para filtros/métricas/agregados. Como
+    # _build_filters ignora None e string vazia, combinações equivalentes
+    # chegam aqui com a mesma chave.
+    return list(await _fetch_all_cached(sql, tuple(sorted(params.items()))))
+
+
 @app.get("/health")
-def health() -> Dict[str, Any]:
+async def health() -> Dict[str, Any]:
     try:
-        with engine.connect() as conn:
-            conn.execute(text("SELECT 1"))
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
         return {"status": "ok", "db": "ok", "timestamp": datetime.utcnow().isoformat()}
     except Exception as exc:
         return {"status": "degraded", "db": "error", "error": str(exc)}
 
 
 @app.get("/filtros")
-def filtros(
+async def filtros(
     ano: Optional[int] = Query(default=None),
     mes: Optional[int] = Query(default=None),
     categoria: Optional[str] = Query(default=None),
     status: Optional[str] = Query(default=None),
     produto: Optional[str] = Query(default=None),
 ) -> Dict[str, List[Any]]:
-    anos_where, anos_params = _build_filters(
-        ano, mes, categoria, status, produto, skip_fields={"ano"}
-    )
-    meses_where, meses_params = _build_filters(
-        ano, mes, categoria, status, produto, skip_fields={"mes"}
-    )
-    categorias_where, categorias_params = _build_filters(
-        ano, mes, categoria, status, produto, skip_fields={"categoria"}
-    )
-    status_where, status_params = _build_filters(
-        ano, mes, categoria, status, produto, skip_fields={"status"}
-    )
-    produtos_where, produtos_params = _build_filters(
-        ano, mes, categoria, status, produto, skip_fields={"produto"}
-    )
+    selects = []
+    params: Dict[str, Any] = {}
+    for kind, column, skip in _FILTROS_COLUNAS:
+        where_sql, kind_params = _build_filters(
+            ano, mes, categoria, status, produto, skip=skip, prefix=f"{kind}_"
+        )
+        if kind == "status":
+            selects.append(
+                f"SELECT '{kind}' AS k, {_STATUS_LABEL_SQL} AS v, MIN({_STATUS_ORDEM_SQL}) AS o "
+                f"FROM mv_filtros {where_sql} GROUP BY {_STATUS_LABEL_SQL}"
+            )
+        else:
+            selects.append(
+                f"SELECT '{kind}' AS k, {column}::text AS v, 0 AS o "
+                f"FROM mv_filtros {where_sql} GROUP BY {column}"
+            )
+        params.update(kind_params)
 
-    anos = _fetch_all(
-        f"SELECT DISTINCT ano_transacao AS ano FROM transacoes {anos_where} ORDER BY ano DESC",
-        anos_params,
-    )
-    meses = _fetch_all(
-        f"SELECT DISTINCT mes_transacao AS mes FROM transacoes {meses_where} ORDER BY mes ASC",
-        meses_params,
-    )
-    categorias = _fetch_all(
-        f"SELECT DISTINCT categoria FROM transacoes {categorias_where} ORDER BY categoria ASC",
-        categorias_params,
-    )
-    status = _fetch_all(
-        f"SELECT DISTINCT status_pagamento FROM transacoes {status_where}",
-        status_params,
-    )
-    produtos = _fetch_all(
-        f"SELECT DISTINCT produto FROM transacoes {produtos_where} ORDER BY produto ASC",
-        produtos_params,
-    )
+    # ORDER BY o deixa os status já na ordem de exibição; as demais listas têm o = 0
+    rows = await _fetch_cached(" UNION ALL ".join(selects) + " ORDER BY o", params)
 
-    status_display = {_map_status_display(r["status_pagamento"]) for r in status}
-    status_order = {
-        "Pago": 0,
-        "Pendente": 1,
-        "Atrasado": 2,
-        "Cancelado": 3,
-        "Erro": 4,
-    }
+    valores: Dict[str, List[str]] = {kind: [] for kind, _, _ in _FILTROS_COLUNAS}
+    for r in rows:
+        valores[r["k"]].append(r["v"])
 
     return {
-        "anos": [r["ano"] for r in anos],
-        "meses": [r["mes"] for r in meses],
-        "categorias": [r["categoria"] for r in categorias],
-        "statusPagamento": sorted(status_display, key=lambda s: status_order.get(s, 99)),
-        "produtos": [r["produto"] for r in produtos],
+        "anos": sorted((int(v) for v in valores["ano"]), reverse=True),
+        "meses": sorted(int(v) for v in valores["mes"]),
+        "categorias": sorted(valores["categoria"]),
+        "statusPagamento": valores["status"],
+        "produtos": sorted(valores["produto"]),
     }
 
 
 @app.get("/transacoes")
-def transacoes(
+async def transacoes(
+    response: Response,
     ano: Optional[int] = Query(default=None),
     mes: Optional[int] = Query(default=None),
     categoria: Optional[str] = Query(default=None),
@@ -290,11 +365,35 @@ def transacoes(
     busca: Optional[str] = Query(default=None),
     limit: int = Query(default=50, ge=1, le=2000),
     offset: int = Query(default=0, ge=0),
+    cursor_data: Optional[datetime] = Query(default=None),
+    cursor_id: Optional[int] = Query(default=None),
     include_total: bool = Query(default=True),
 ) -> Dict[str, Any]:
     where_sql, params = _build_filters(ano, mes, categoria, status, produto, busca)
     count_params = dict(params)
-    params.update({"limit": limit, "offset": offset})
+    params["limit"] = limit
+
+    # Paginação por cursor (keyset): continua após a última linha da página anterior
+    # sem percorrer e descartar as linhas de OFFSET
+    use_cursor = cursor_data is not None and cursor_id is not None
+    if use_cursor:
+        page_where = _combine_where(
+            where_sql, "(data_transacao, id) < (:cursor_data, :cursor_id)"
+        )
+        params.update({"cursor_data": cursor_data, "cursor_id": cursor_id})
+        page_sql = "LIMIT :limit"
+        offset = 0
+    else:
+        page_where = where_sql
+        params["offset"] = offset
+        page_sql = "LIMIT :limit OFFSET :offset"
+        if offset > 0:
+            response.headers["Deprecation"] = "true"
+
+    # O total sai na mesma varredura da página, calculado antes do LIMIT/OFFSET.
+    # Com cursor o predicado de keyset restringe a janela, então conta à parte.
+    use_window = include_total and not use_cursor
+    total_sql = ",\n            COUNT(*) OVER ()::int AS _total" if use_window else ""
 
     sql = f"""
         SELECT
@@ -304,14 +403,7 @@ def transacoes(
             produto,
             categoria,
             valor::float AS valor,
-            CASE
-                WHEN status_pagamento = 'PAGO' THEN 'Pago'
-                WHEN status_pagamento = 'PENDENTE' THEN 'Pendente'
-                WHEN status_pagamento = 'CANCELADO' THEN 'Cancelado'
-                WHEN status_pagamento = 'ATRASADO' THEN 'Atrasado'
-                WHEN status_pagamento = 'ERRO' THEN 'Erro'
-                ELSE 'Erro'
-            END AS status_pagamento,
+            status_pagamento,
             arquivo_origem,
             data_transacao,
             data_processamento,
@@ -319,25 +411,55 @@ def transacoes(
             dia_semana,
             mes_transacao,
             trimestre,
-            ano_transacao
+            ano_transacao{total_sql}
         FROM transacoes
-        {where_sql}
-        ORDER BY data_transacao DESC
-        LIMIT :limit OFFSET :offset
+        {page_where}
+        ORDER BY data_transacao DESC, id DESC
+        {page_sql}
     """
 
-    rows = _fetch_all(sql, params)
-    total = None
-    if include_total:
-        total = _fetch_one(
-            f"SELECT COUNT(*)::int AS total FROM transacoes {where_sql}",
-            count_params,
-        ).get("total", 0)
-    return {"items": rows, "limit": limit, "offset": offset, "total": total}
+    async with read_engine.connect() as conn:
+        rows = await _fetch_all(sql, params, conn=conn)
+
+        total = None
+        if include_total:
+            if use_window and rows:
+                total = rows[0]["_total"]
+            elif use_window and offset == 0:
+                total = 0
+            else:
+                # Página além do fim ou cursor: a janela não cobre o filtro inteiro
+                total = (
+                    await _fetch_one(
+                        f"SELECT COUNT(*)::int AS total FROM transacoes {where_sql}",
+                        count_params,
+                        conn=conn,
+                    )
+                ).get("total", 0)
+
+    items = []
+    for row in rows:
+        item = dict(row)
+        item["status_pagamento"] = _STATUS_MAP.get(item["status_pagamento"], "Erro")
+        item.pop("_total", None)
+        items.append(item)
+
+    next_cursor = None
+    if len(rows) == limit:
+        last = rows[-1]
+        next_cursor = {"data": last["data_transacao"].isoformat(), "id": last["id"]}
+
+    return {
+        "items": items,
+        "limit": limit,
+        "offset": offset,
+        "total": total,
+        "next_cursor": next_cursor,
+    }
 
 
 @app.get("/transacoes/total")
-def transacoes_total(
+async def transacoes_total(
     ano: Optional[int] = Query(default=None),
     mes: Optional[int] = Query(default=None),
     categoria: Optional[str] = Query(default=None),
@@ -346,73 +468,72 @@ def transacoes_total(
     busca: Optional[str] = Query(default=None),
 ) -> Dict[str, Any]:
     where_sql, params = _build_filters(ano, mes, categoria, status, produto, busca)
-    total = _fetch_one(
-        f"SELECT COUNT(*)::int AS total FROM transacoes {where_sql}",
-        params,
+    total = (
+        await _fetch_one(
+            f"SELECT COUNT(*)::int AS total FROM transacoes {where_sql}",
+            params,
+        )
     ).get("total", 0)
     return {"total": total}
 
 
 @app.get("/transacoes/{id_transacao}")
-def transacao_detalhe(id_transacao: str) -> Dict[str, Any]:
-    transacao = _fetch_one(
-        """
-        SELECT
-            id,
-            id_transacao,
-            cliente,
-            produto,
-            categoria,
-            valor::float AS valor,
-            CASE
-                WHEN status_pagamento = 'PAGO' THEN 'Pago'
-                WHEN status_pagamento = 'PENDENTE' THEN 'Pendente'
-                WHEN status_pagamento = 'CANCELADO' THEN 'Cancelado'
-                WHEN status_pagamento = 'ATRASADO' THEN 'Atrasado'
-                WHEN status_pagamento = 'ERRO' THEN 'Erro'
-                ELSE 'Erro'
-            END AS status_pagamento,
-            arquivo_origem,
-            data_transacao,
-            data_processamento,
-            data_pagamento,
-            dia_semana,
-            mes_transacao,
-            trimestre,
-            ano_transacao
-        FROM transacoes
-        WHERE id_transacao = :id_transacao
-        """,
-        {"id_transacao": id_transacao},
-    )
-
-    if not transacao:
-        return {"transacao": None, "itens": []}
+async def transacao_detalhe(id_transacao: str) -> Dict[str, Any]:
+    async with read_engine.connect() as conn:
+        transacao = await _fetch_one(
+            """
+            SELECT
+                id,
+                id_transacao,
+                cliente,
+                produto,
+                categoria,
+                valor::float AS valor,
+                status_pagamento,
+                arquivo_origem,
+                data_transacao,
+                data_processamento,
+                data_pagamento,
+                dia_semana,
+                mes_transacao,
+                trimestre,
+                ano_transacao
+            FROM transacoes
+            WHERE id_transacao = :id_transacao
+            """,
+            {"id_transacao": id_transacao},
+            conn=conn,
+        )
 
-    itens = _fetch_all(
-        """
-        SELECT
-            i.id_transacao,
-            p.nome AS produto,
-            c.nome AS categoria,
-            p.descricao AS produto_descricao,
-            i.quantidade,
-            i.valor_unitario::float AS valor_unitario,
-            i.valor_total::float AS valor_total
-        FROM transacao_itens i
-        JOIN produtos p ON p.id = i.produto_id
-        JOIN categorias c ON c.id = p.categoria_id
-        WHERE i.id_transacao = :id_transacao
-        ORDER BY i.valor_total DESC
-        """,
-        {"id_transacao": id_transacao},
-    )
+        if not transacao:
+            return {"transacao": None, "itens": []}
+        transacao["status_pagamento"] = _STATUS_MAP.get(transacao["status_pagamento"], "Erro")
+
+        itens = await _fetch_all(
+            """
+            SELECT
+                i.id_transacao,
+                p.nome AS produto,
+                c.nome AS categoria,
+                p.descricao AS produto_descricao,
+                i.quantidade,
+                i.valor_unitario::float AS valor_unitario,
+                i.valor_total::float AS valor_total
+            FROM transacao_itens i
+            JOIN produtos p ON p.id = i.produto_id
+            JOIN categorias c ON c.id = p.categoria_id
+            WHERE i.id_transacao = :id_transacao
+            ORDER BY i.valor_total DESC
+            """,
+            {"id_transacao": id_transacao},
+            conn=conn,
+        )
 
-    return {"transacao": transacao, "itens": itens}
+    return {"transacao": transacao, "itens": [dict(item) for item in itens]}
 
 
 @app.get("/metricas")
-def metricas(
+async def metricas(
     ano: Optional[int] = Query(default=None),
     mes: Optional[int] = Query(default=None),
     categoria: Optional[str] = Query(default=None),
@@ -420,11 +541,11 @@ def metricas(
     produto: Optional[str] = Query(default=None),
 ) -> Dict[str, Any]:
     where_sql, params = _build_filters(ano, mes, categoria, status, produto)
-    return _fetch_metricas(where_sql, params)
+    return await _fetch_metricas(where_sql, params)
 
 
 @app.get("/metricas/comparativo")
-def metricas_comparativo(
+async def metricas_comparativo(
     ano: Optional[int] = Query(default=None),
     mes: Optional[int] = Query(default=None),
     categoria: Optional[str] = Query(default=None),
@@ -432,7 +553,7 @@ def metricas_comparativo(
     produto: Optional[str] = Query(default=None),
     busca: Optional[str] = Query(default=None),
 ) -> Dict[str, Any]:
-    periodo_atual = _resolve_periodo_atual(ano, mes, categoria, status, produto, busca)
+    periodo_atual = await _resolve_periodo_atual(ano, mes, categoria, status, produto, busca)
     if not periodo_atual:
         return {
             "valorTotalAnterior": 0,
@@ -448,40 +569,39 @@ def metricas_comparativo(
     label = _periodo_label(periodo_atual)
 
     base_where, base_params = _build_filters(
-        None, None, categoria, status, produto, busca, skip_fields={"ano", "mes"}
+        None, None, categoria, status, produto, busca, skip=_SKIP_ANO | _SKIP_MES
     )
 
+    params = dict(base_params)
+    params["ano_atual"] = periodo_atual["ano"]
+    params["ano_anterior"] = periodo_anterior["ano"]
     if periodo_atual["tipo"] == "ano":
-        where_atual = _combine_where(base_where, "ano_transacao = :ano_atual")
-        params_atual = dict(base_params)
-        params_atual["ano_atual"] = periodo_atual["ano"]
-
-        where_anterior = _combine_where(base_where, "ano_transacao = :ano_anterior")
-        params_anterior = dict(base_params)
-        params_anterior["ano_anterior"] = periodo_anterior["ano"]
+        pred_atual = "ano_transacao = :ano_atual"
+        pred_anterior = "ano_transacao = :ano_anterior"
     else:
-        where_atual = _combine_where(
-            base_where, "ano_transacao = :ano_atual AND mes_transacao = :mes_atual"
-        )
-        params_atual = dict(base_params)
-        params_atual["ano_atual"] = periodo_atual["ano"]
-        params_atual["mes_atual"] = periodo_atual["mes"]
+        pred_atual = "ano_transacao = :ano_atual AND mes_transacao = :mes_atual"
+        pred_anterior = "ano_transacao = :ano_anterior AND mes_transacao = :mes_anterior"
+        params["mes_atual"] = periodo_atual["mes"]
+        params["mes_anterior"] = periodo_anterior["mes"]
 
-        where_anterior = _combine_where(
-            base_where,
-            "ano_transacao = :ano_anterior AND mes_transacao = :mes_anterior",
-        )
-        params_anterior = dict(base_params)
-        params_anterior["ano_anterior"] = periodo_anterior["ano"]
-        params_anterior["mes_anterior"] = periodo_anterior["mes"]
-
-    metricas_atual = _fetch_metricas(where_atual, params_atual)
-    metricas_anterior = _fetch_metricas(where_anterior, params_anterior)
+    # Os dois períodos saem de uma única varredura, separados por FILTER
+    where_sql = _combine_where(base_where, f"(({pred_atual}) OR ({pred_anterior}))")
+    sql = f"""
+        SELECT
+            COUNT(*) FILTER (WHERE {pred_atual})::int AS qtd_atual,
+            COUNT(*) FILTER (WHERE {pred_anterior})::int AS qtd_anterior,
+            COALESCE(SUM(valor) FILTER (WHERE {pred_atual}), 0)::float AS valor_atual,
+            COALESCE(SUM(valor) FILTER (WHERE {pred_anterior}), 0)::float AS valor_anterior
+        FROM transacoes
+        {where_sql}
+    """
+    rows = await _fetch_cached(sql, params)
+    comparativo = rows[0] if rows else {}
 
-    valor_atual = metricas_atual.get("valor_total", 0) or 0
-    valor_anterior = metricas_anterior.get("valor_total", 0) or 0
-    qtd_atual = metricas_atual.get("quantidade_transacoes", 0) or 0
-    qtd_anterior = metricas_anterior.get("quantidade_transacoes", 0) or 0
+    valor_atual = comparativo.get("valor_atual", 0) or 0
+    valor_anterior = comparativo.get("valor_anterior", 0) or 0
+    qtd_atual = comparativo.get("qtd_atual", 0) or 0
+    qtd_anterior = comparativo.get("qtd_anterior", 0) or 0
 
     variacao_valor = (
         ((valor_atual - valor_anterior) / valor_anterior) * 100
@@ -504,7 +624,7 @@ def metricas_comparativo(
 
 
 @app.get("/agregados/categorias")
-def agregados_categorias(
+async def agregados_categorias(
     ano: Optional[int] = Query(default=None),
     mes: Optional[int] = Query(default=None),
     status: Optional[str] = Query(default=None),
@@ -515,19 +635,19 @@ def agregados_categorias(
     sql = f"""
         SELECT
             categoria,
-            COUNT(*)::int AS quantidade,
+            COALESCE(SUM(quantidade), 0)::int AS quantidade,
             COALESCE(SUM(valor), 0)::float AS valor
-        FROM transacoes
+        FROM mv_agregado
         {where_sql}
         GROUP BY categoria
         ORDER BY valor DESC
     """
 
-    return _fetch_all(sql, params)
+    return await _fetch_cached(sql, params)
 
 
 @app.get("/agregados/volume-mensal")
-def agregados_volume_mensal(
+async def agregados_volume_mensal(
     ano: Optional[int] = Query(default=None),
     categoria: Optional[str] = Query(default=None),
     status: Optional[str] = Query(default=None),
@@ -539,19 +659,19 @@ def agregados_volume_mensal(
         SELECT
             ano_transacao AS ano,
             mes_transacao AS mes,
-            COUNT(*)::int AS quantidade,
+            COALESCE(SUM(quantidade), 0)::int AS quantidade,
             COALESCE(SUM(valor), 0)::float AS valor
-        FROM transacoes
+        FROM mv_agregado
         {where_sql}
         GROUP BY ano_transacao, mes_transacao
         ORDER BY ano_transacao, mes_transacao
     """
 
-    return _fetch_all(sql, params)
+    return await _fetch_cached(sql, params)
 
 
 @app.get("/agregados/dia-semana")
-def agregados_dia_semana(
+async def agregados_dia_semana(
     ano: Optional[int] = Query(default=None),
     mes: Optional[int] = Query(default=None),
     categoria: Optional[str] = Query(default=None),
@@ -572,12 +692,12 @@ def agregados_dia_semana(
                 WHEN 5 THEN 'Sábado'
                 WHEN 6 THEN 'Domingo'
             END AS dia,
-            COUNT(*)::int AS quantidade,
+            COALESCE(SUM(quantidade), 0)::int AS quantidade,
             COALESCE(SUM(valor), 0)::float AS valor
-        FROM transacoes
+        FROM mv_agregado
         {where_sql}
         GROUP BY dia_semana
         ORDER BY dia_semana
     """
 
-    return _fetch_all(sql, params)
+    return await _fetch_cached(sql, params)
@@ -1,32 +1,33 @@
-import json
-from datetime import date, datetime
+from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict
 
+import orjson
 from sqlalchemy import text
 
 from scripts.models import get_engine
 
 
-def _map_status_display(status_db: str) -> str:
-    status_upper = (status_db or "").strip().upper()
-    if status_upper == "PAGO":
-        return "Pago"
-    if status_upper == "PENDENTE":
-        return "Pendente"
-    if status_upper == "CANCELADO":
-        return "Cancelado"
-    if status_upper == "ATRASADO":
-        return "Atrasado"
-    if status_upper == "ERRO":
-        return "Erro"
-    return "Erro"
+# Rótulos dos status (também usados pelos endpoints em api/main.py)
+_STATUS_MAP = {
+    "PAGO": "Pago",
+    "PENDENTE": "Pendente",
+    "CANCELADO": "Cancelado",
+    "ATRASADO": "Atrasado",
+    "ERRO": "Erro",
+}
 
 
-def _json_default(value: Any) -> Any:
-    if isinstance(value, (datetime, date)):
-        return value.isoformat()
-    return value
+# Rótulo e ordem de exibição dos status, resolvidos no próprio SQL das listas de filtros
+_STATUS_LABEL_SQL = (
+    "CASE status_pagamento WHEN 'PAGO' THEN 'Pago' WHEN 'PENDENTE' THEN 'Pendente' "
+    "WHEN 'CANCELADO' THEN 'Cancelado' WHEN 'ATRASADO' THEN 'Atrasado' ELSE 'Erro' END"
+)
+_STATUS_ORDEM_SQL = (
+    "CASE status_pagamento WHEN 'PAGO' THEN 0 WHEN 'PENDENTE' THEN 1 "
+    "WHEN 'ATRASADO' THEN 2 WHEN 'CANCELADO' THEN 3 ELSE 4 END"
+)
 
 
 def _snapshot_path() -> Path:
@@ -36,44 +37,14 @@ def _snapshot_path() -> Path:
     return dashboard_public / "mock.json"
 
 
-def generate_snapshot(limit: int = 2000) -> Dict[str, Any]:
-    engine = get_engine()
-    with engine.connect() as conn:
-        rows = conn.execute(
-            text(
-                """
-                SELECT
-                    id,
-                    id_transacao,
-                    cliente,
-                    produto,
-                    categoria,
-                    valor::float AS valor,
-                    CASE
-                        WHEN status_pagamento = 'PAGO' THEN 'Pago'
-                        WHEN status_pagamento = 'PENDENTE' THEN 'Pendente'
-                        WHEN status_pagamento = 'CANCELADO' THEN 'Cancelado'
-                        WHEN status_pagamento = 'ATRASADO' THEN 'Atrasado'
-                        WHEN status_pagamento = 'ERRO' THEN 'Erro'
-                        ELSE 'Erro'
-                    END AS status_pagamento,
-                    arquivo_origem,
-                    data_transacao,
-                    data_processamento,
-                    data_pagamento,
-                    dia_semana,
-                    mes_transacao,
-                    trimestre,
-                    ano_transacao
-                FROM transacoes
-                ORDER BY data_transacao DESC
-                LIMIT :limit
-                """
-            ),
-            {"limit": limit},
-        ).mappings()
-        items = [dict(r) for r in rows]
+@lru_cache(maxsize=1)
+def _engine():
+    # Engine síncrono criado uma vez: o loop de snapshot reaproveita o mesmo pool
+    return get_engine()
 
+
+def generate_snapshot(limit: int = 2000) -> Dict[str, Any]:
+    with _engine().connect() as conn:
         anos = conn.execute(
             text("SELECT DISTINCT ano_transacao AS ano FROM transacoes ORDER BY ano DESC")
         ).mappings()
@@ -83,22 +54,16 @@ def generate_snapshot(limit: int = 2000) -> Dict[str, Any]:
         categorias = conn.execute(
             text("SELECT DISTINCT categoria FROM transacoes ORDER BY categoria ASC")
         ).mappings()
-        status_raw = conn.execute(
-            text("SELECT DISTINCT status_pagamento FROM transacoes")
+        status_rows = conn.execute(
+            text(
+                f"SELECT {_STATUS_LABEL_SQL} AS label FROM transacoes "
+                f"GROUP BY {_STATUS_LABEL_SQL} ORDER BY MIN({_STATUS_ORDEM_SQL})"
+            )
         ).mappings()
         produtos = conn.execute(
             text("SELECT DISTINCT produto FROM transacoes ORDER BY produto ASC")
         ).mappings()
 
-        status_display = {_map_status_display(r["status_pagamento"]) for r in status_raw}
-        status_order = {
-            "Pago": 0,
-            "Pendente": 1,
-            "Atrasado": 2,
-            "Cancelado": 3,
-            "Erro": 4,
-        }
-
         metricas = conn.execute(
             text(
                 """
@@ -106,22 +71,18 @@ def generate_snapshot(limit: int = 2000) -> Dict[str, Any]:
                     COUNT(*)::int AS quantidade_transacoes,
                     COALESCE(SUM(valor), 0)::float AS valor_total,
                     COALESCE(AVG(valor), 0)::float AS ticket_medio,
-                    COALESCE(SUM(CASE WHEN status_pagamento = 'PAGO' THEN 1 ELSE 0 END), 0)::int
-                        AS quantidade_pagas,
+                    COUNT(*) FILTER (WHERE status_pagamento = 'PAGO')::int AS quantidade_pagas,
                     COALESCE(
                         ROUND(
-                            100.0 * SUM(CASE WHEN status_pagamento = 'PAGO' THEN 1 ELSE 0 END)
+                            100.0 * COUNT(*) FILTER (WHERE status_pagamento = 'PAGO')
                             / NULLIF(COUNT(*), 0)::numeric,
                             2
                         ),
                         0
                     )::float AS percentual_pagas,
+                    COALESCE(AVG(dias_processamento), 0)::float AS tempo_medio_processamento,
                     COALESCE(
-                        AVG(EXTRACT(EPOCH FROM (data_processamento - data_transacao)) / 86400.0),
-                        0
-                    )::float AS tempo_medio_processamento,
-                    COALESCE(
-                        AVG(EXTRACT(EPOCH FROM (data_pagamento - data_transacao)) / 86400.0)
+                        AVG(dias_pagamento)
                             FILTER (WHERE data_pagamento IS NOT NULL),
                         0
                     )::float AS tempo_medio_pagamento
@@ -182,26 +143,75 @@ def generate_snapshot(limit: int = 2000) -> Dict[str, Any]:
             )
         ).mappings().all()
 
-    payload = {
-        "generated_at": datetime.utcnow().isoformat(),
-        "limit": limit,
-        "transacoes": items,
-        "filtros": {
-            "anos": [r["ano"] for r in anos],
-            "meses": [r["mes"] for r in meses],
-            "categorias": [r["categoria"] for r in categorias],
-            "statusPagamento": sorted(status_display, key=lambda s: status_order.get(s, 99)),
-            "produtos": [r["produto"] for r in produtos],
-        },
-        "metricas": dict(metricas) if metricas else {},
-        "categorias": [dict(r) for r in categorias_ag],
-        "volume_mensal": [dict(r) for r in volume_mensal],
-        "dias_semana": [dict(r) for r in dias_semana],
-    }
-
-    path = _snapshot_path()
-    path.write_text(json.dumps(payload, ensure_ascii=False, default=_json_default), encoding="utf-8")
-    return {"path": str(path), "count": len(items)}
+        resto = {
+            "filtros": {
+                "anos": [r["ano"] for r in anos],
+                "meses": [r["mes"] for r in meses],
+                "categorias": [r["categoria"] for r in categorias],
+                "statusPagamento": [r["label"] for r in status_rows],
+                "produtos": [r["produto"] for r in produtos],
+            },
+            "metricas": dict(metricas) if metricas else {},
+            "categorias": [dict(r) for r in categorias_ag],
+            "volume_mensal": [dict(r) for r in volume_mensal],
+            "dias_semana": [dict(r) for r in dias_semana],
+        }
+
+        path = _snapshot_path()
+        tmp_path = path.with_suffix(".json.tmp")
+        count = 0
+        # O array de transações é escrito lote a lote direto no arquivo: o cursor no
+        # servidor entrega yield_per linhas por vez e cada lote vira um trecho do JSON.
+        # orjson serializa datetime/date nativamente e já devolve bytes UTF-8.
+        with tmp_path.open("wb") as handle:
+            cabecalho = orjson.dumps(
+                {"generated_at": datetime.utcnow().isoformat(), "limit": limit}
+            )
+            handle.write(cabecalho[:-1] + b',"transacoes":[')
+
+            result = conn.execute(
+                text(
+                    """
+                    SELECT
+                        id,
+                        id_transacao,
+                        cliente,
+                        produto,
+                        categoria,
+                        valor::float AS valor,
+                        status_pagamento,
+                        arquivo_origem,
+                        data_transacao,
+                        data_processamento,
+                        data_pagamento,
+                        dia_semana,
+                        mes_transacao,
+                        trimestre,
+                        ano_transacao
+                    FROM transacoes
+                    ORDER BY data_transacao DESC
+                    LIMIT :limit
+                    """
+                ),
+                {"limit": limit},
+                execution_options={"stream_results": True, "yield_per": 500},
+            )
+            for partition in result.mappings().partitions():
+                chunk = []
+                for row in partition:
+                    item = dict(row)
+                    item["status_pagamento"] = _STATUS_MAP.get(item["status_pagamento"], "Erro")
+                    chunk.append(item)
+                if count:
+                    handle.write(b",")
+                handle.write(orjson.dumps(chunk)[1:-1])
+                count += len(chunk)
+
+            handle.write(b"]," + orjson.dumps(resto)[1:])
+
+    # Troca atômica para o dashboard nunca ler um arquivo pela metade
+    tmp_path.replace(path)
+    return {"path": str(path), "count": count}
 
 
 def generate_snapshot_safe(limit: int = 2000) -> Dict[str, Any]:
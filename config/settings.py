@@ -2,81 +2,146 @@
 ETL Pipeline - Configurações
 ============================
 
-Módulo de configuração centralizado usando Pydantic Settings.
+Módulo de configuração centralizado (dataclass + variáveis de ambiente).
 Carrega variáveis de ambiente do arquivo .env e valida os valores.
 
 Autor: Kaio Ambrosio
 """
 
+import os
+from dataclasses import dataclass, field, fields
 from functools import lru_cache
 from pathlib import Path
+from typing import Any, Dict, Mapping
 from urllib.parse import quote_plus
 
-from pydantic import Field, field_validator
-from pydantic_settings import BaseSettings, SettingsConfigDict
+from dotenv import dotenv_values
 
 # Diretório raiz do projeto
 ROOT_DIR = Path(__file__).parent.parent
 
+# Valores aceitos em variáveis booleanas (qualquer outro é rejeitado)
+_TRUE_VALUES = {"1", "true", "yes", "on", "y", "t"}
+_FALSE_VALUES = {"0", "false", "no", "off", "n", "f", ""}
+
+
+def _cast(nome: str, value: str, tipo: type) -> Any:
+    """Converte o texto de uma variável de ambiente para o tipo do campo."""
+    if tipo is bool:
+        normalizado = value.strip().lower()
+        if normalizado in _TRUE_VALUES:
+            return True
+        if normalizado in _FALSE_VALUES:
+            return False
+        raise ValueError(
+            f"Valor booleano inválido para {nome.upper()}: {value!r}. "
+            f"Use: {sorted((_TRUE_VALUES | _FALSE_VALUES) - {''})}"
+        )
+    if tipo is int:
+        return int(value.strip())
+    return value
+
 
-class Settings(BaseSettings):
+@dataclass(frozen=True, slots=True)
+class Settings:
     """
     Configurações do Pipeline ETL.
 
-    Carrega automaticamente variáveis do arquivo .env
-    e valida os valores usando Pydantic.
+    Carregadas de variáveis de ambiente e do arquivo .env (o ambiente tem
+    precedência). Os nomes são os dos campos, sem diferenciar maiúsculas.
     """
 
-    model_config = SettingsConfigDict(
-        env_file=ROOT_DIR / ".env", env_file_encoding="utf-8", case_sensitive=False, extra="ignore"
-    )
-
     # -------------------------------------------------------------------------
     # Configurações do Banco de Dados PostgreSQL
     # -------------------------------------------------------------------------
-    db_host: str = Field(default="localhost", description="Host do PostgreSQL")
-    db_port: int = Field(default=5432, description="Porta do PostgreSQL")
-    db_name: str = Field(default="etl_portfolio", description="Nome do banco de dados")
-    db_user: str = Field(default="postgres", description="Usuário do banco")
-    db_password: str = Field(default="", description="Senha do banco")
+    db_host: str = field(default="localhost", metadata={"description": "Host do PostgreSQL"})
+    db_port: int = field(default=5432, metadata={"description": "Porta do PostgreSQL"})
+    db_name: str = field(default="etl_portfolio", metadata={"description": "Nome do banco"})
+    db_user: str = field(default="postgres", metadata={"description": "Usuário do banco"})
+    db_password: str = field(default="", metadata={"description": "Senha do banco"})
 
     # -------------------------------------------------------------------------
     # Configurações do Pipeline ETL
     # -------------------------------------------------------------------------
-    etl_log_level: str = Field(default="INFO", description="Nível de log")
-    etl_batch_size: int = Field(default=1000, description="Tamanho do lote para inserção")
-    etl_use_copy: bool = Field(
-        default=False, description="Usar COPY nativo do PostgreSQL para cargas grandes"
+    etl_log_level: str = field(default="INFO", metadata={"description": "Nível de log"})
+    etl_batch_size: int = field(
+        default=1000, metadata={"description": "Tamanho do lote para inserção"}
+    )
+    etl_use_copy: bool = field(
+        default=False,
+        metadata={"description": "Usar COPY nativo do PostgreSQL para cargas grandes"},
     )
-    etl_copy_threshold: int = Field(
-        default=200000, description="Quantidade minima de registros para ativar COPY"
+    etl_copy_threshold: int = field(
+        default=200000,
+        metadata={"description": "Quantidade minima de registros para ativar COPY"},
     )
-    etl_data_raw_path: str = Field(default="data/raw", description="Caminho dos dados brutos")
-    etl_data_processed_path: str = Field(
-        default="data/processed", description="Caminho dos dados processados"
+    etl_use_copy_async: bool = field(
+        default=False,
+        metadata={"description": "Executar o COPY via asyncpg, em blocos paralelos"},
+    )
+    etl_data_raw_path: str = field(
+        default="data/raw", metadata={"description": "Caminho dos dados brutos"}
+    )
+    etl_data_processed_path: str = field(
+        default="data/processed", metadata={"description": "Caminho dos dados processados"}
     )
 
     # -------------------------------------------------------------------------
     # Configurações da API
     # -------------------------------------------------------------------------
-    api_cors_origins: str = Field(
+    api_env: str = field(default="dev", metadata={"description": "Ambiente da API (dev ou prod)"})
+    api_cors_origins: str = field(
         default="http://localhost:5173",
-        description="Origens permitidas para CORS (separadas por vírgula)",
+        metadata={"description": "Origens permitidas para CORS (separadas por vírgula)"},
     )
-    api_snapshot_limit: int = Field(
+    api_snapshot_limit: int = field(
         default=2000,
-        description="Quantidade máxima de registros para snapshot do dashboard",
+        metadata={"description": "Quantidade máxima de registros para snapshot do dashboard"},
+    )
+    api_snapshot_interval_min: int = field(
+        default=0,
+        metadata={"description": "Intervalo em minutos para regenerar o snapshot (0 desativa)"},
+    )
+    api_busca_fulltext: bool = field(
+        default=True,
+        metadata={
+            "description": "Usar a coluna tsvector (search_doc) no filtro de busca em vez de ILIKE"
+        },
+    )
+    api_cache_ttl_seconds: int = field(
+        default=30,
+        metadata={"description": "TTL em segundos do cache de filtros, métricas e agregados"},
     )
 
-    @field_validator("etl_log_level")
-    @classmethod
-    def validate_log_level(cls, v: str) -> str:
+    def __post_init__(self) -> None:
         """Valida o nível de log."""
         valid_levels = {"DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"}
-        v_upper = v.upper()
+        v_upper = self.etl_log_level.upper()
         if v_upper not in valid_levels:
-            raise ValueError(f"Nível de log inválido: {v}. Use: {valid_levels}")
-        return v_upper
+            raise ValueError(f"Nível de log inválido: {self.etl_log_level}. Use: {valid_levels}")
+        object.__setattr__(self, "etl_log_level", v_upper)
+
+    @classmethod
+    def from_env(cls, env: Mapping[str, str] = os.environ) -> "Settings":
+        """
+        Monta as configurações a partir do .env e das variáveis de ambiente.
+
+        Args:
+            env: Variáveis de ambiente (padrão: os.environ).
+
+        Returns:
+            Settings: Instância com os valores encontrados (ou os padrões).
+        """
+        valores: Dict[str, str] = {}
+        for fonte in (dotenv_values(ROOT_DIR / ".env", encoding="utf-8"), env):
+            for chave, valor in fonte.items():
+                if valor is not None:
+                    valores[chave.lower()] = valor
+
+        kwargs = {
+            f.name: _cast(f.name, valores[f.name], f.type) for f in fields(cls) if f.name in valores
+        }
+        return cls(**kwargs)
 
     @property
     def database_url(self) -> str:
@@ -88,6 +153,15 @@ class Settings(BaseSettings):
             f"@{self.db_host}:{self.db_port}/{self.db_name}"
         )
 
+    @property
+    def database_url_async(self) -> str:
+        """Retorna a URL de conexão do PostgreSQL para o driver assíncrono (asyncpg)."""
+        encoded_password = quote_plus(self.db_password)
+        return (
+            f"postgresql+asyncpg://{self.db_user}:{encoded_password}"
+            f"@{self.db_host}:{self.db_port}/{self.db_name}"
+        )
+
     @property
     def database_url_masked(self) -> str:
         """Retorna a URL de conexão com senha mascarada (para logs)."""
@@ -126,7 +200,7 @@ def get_settings() -> Settings:
         >>> print(settings.db_host)
         'localhost'
     """
-    return Settings()
+    return Settings.from_env()
 
 
 if __name__ == "__main__":
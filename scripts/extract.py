@@ -8,38 +8,67 @@ Implementa validação de estrutura e tratamento de erros.
 Autor: Kaio Ambrosio
 """
 
+import csv
 import hashlib
+import json
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass, field
+from functools import lru_cache
+from importlib.util import find_spec
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import TYPE_CHECKING, AbstractSet, Dict, Iterator, List, Optional, Tuple
 
-import pandas as pd
 from loguru import logger
 
+# pandas, pyarrow e charset_normalizer são importados sob demanda nos métodos de
+# leitura: `import scripts.extract` fica leve para o CLI e para quem só lista arquivos
+if TYPE_CHECKING:
+    import pandas as pd
+    import pyarrow as pa
+    from pyarrow import csv as pacsv
+
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from config.settings import get_settings
 
 # Colunas obrigatórias esperadas nos arquivos de entrada
-REQUIRED_COLUMNS = {
-    "id_transacao",
-    "data_transacao",
-    "cliente",
-    "produto",
-    "categoria",
-    "valor",
-    "status_pagamento",
-}
+REQUIRED_COLUMNS = frozenset(
+    {
+        "id_transacao",
+        "data_transacao",
+        "cliente",
+        "produto",
+        "categoria",
+        "valor",
+        "status_pagamento",
+    }
+)
 
 # Colunas opcionais
-OPTIONAL_COLUMNS = {"data_pagamento"}
+OPTIONAL_COLUMNS = frozenset({"data_pagamento"})
+
+# União pré-calculada para a validação padrão (evita refazer a união a cada arquivo)
+_EXPECTED = REQUIRED_COLUMNS | OPTIONAL_COLUMNS
 
 # Extensões de arquivo suportadas
-SUPPORTED_EXTENSIONS = {".csv", ".xlsx", ".xls"}
+SUPPORTED_EXTENSIONS = frozenset({".csv", ".xlsx", ".xls"})
+
+# Colunas de texto com poucos valores distintos, lidas como categóricas (dicionário)
+CATEGORY_COLUMNS = frozenset({"cliente", "produto", "categoria", "status_pagamento"})
+
+# Amostra usada para detectar o separador do CSV
+SNIFF_SAMPLE_SIZE = 64 * 1024
 
+# Tamanho (bytes) de cada bloco na leitura em streaming de CSVs grandes
+CHUNK_BLOCK_SIZE = 64 * 1024 * 1024
 
-@dataclass
+# Cache de hashes por arquivo (mtime_ns + tamanho), gravado na pasta de dados brutos
+HASH_CACHE_FILE = ".hash_cache.json"
+
+
+@dataclass(slots=True)
 class ExtractionResult:
     """
     Resultado da extração de um arquivo.
@@ -52,15 +81,17 @@ class ExtractionResult:
         records_count: Quantidade de registros extraídos.
         error_message: Mensagem de erro, se houver.
         warnings: Lista de avisos durante a extração.
+        dataframe_iter: Iterador de DataFrames (leitura em blocos via extract_file_chunks).
     """
 
     success: bool
-    dataframe: Optional[pd.DataFrame] = None
+    dataframe: Optional["pd.DataFrame"] = None
     file_path: str = ""
     file_hash: str = ""
     records_count: int = 0
     error_message: Optional[str] = None
     warnings: List[str] = field(default_factory=list)
+    dataframe_iter: Optional[Iterator["pd.DataFrame"]] = None
 
 
 class DataExtractor:
@@ -81,55 +112,115 @@ class DataExtractor:
         """
         self.settings = get_settings()
         self.raw_data_path = raw_data_path or self.settings.raw_data_path
+        self._hash_cache_path = self.raw_data_path / HASH_CACHE_FILE
+        self._hash_cache = self._load_hash_cache()
+        self._hash_cache_dirty = False
+        # Último separador detectado em cada pasta (arquivos vizinhos costumam repetir)
+        self._delim_cache: Dict[Path, str] = {}
 
-        logger.info(f"DataExtractor inicializado. Pasta de dados: {self.raw_data_path}")
+        logger.info("DataExtractor inicializado. Pasta de dados: {}", self.raw_data_path)
+
+    def _load_hash_cache(self) -> Dict[str, Dict]:
+        """
+        Carrega o cache de hashes gravado por execuções anteriores.
+
+        Returns:
+            Dicionário {caminho: {"mtime_ns", "size", "hash"}} (vazio se ausente).
+        """
+        try:
+            return json.loads(self._hash_cache_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+    def _remember_hash(self, file_path: Path, stat: os.stat_result, file_hash: str) -> None:
+        """Registra o hash de um arquivo no cache em memória."""
+        self._hash_cache[str(file_path.resolve())] = {
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "hash": file_hash,
+        }
+        self._hash_cache_dirty = True
+
+    def save_hash_cache(self) -> None:
+        """Grava o cache de hashes em disco, se houve alteração."""
+        if not self._hash_cache_dirty:
+            return
+        try:
+            self._hash_cache_path.write_text(json.dumps(self._hash_cache), encoding="utf-8")
+            self._hash_cache_dirty = False
+        except OSError as e:
+            logger.warning("Não foi possível gravar o cache de hashes: {}", e)
 
     def calculate_file_hash(self, file_path: Path) -> str:
         """
         Calcula o hash MD5 de um arquivo.
 
+        Reaproveita o hash do cache quando mtime e tamanho do arquivo não mudaram.
+
         Args:
             file_path: Caminho do arquivo.
 
         Returns:
             Hash MD5 em hexadecimal.
         """
-        hash_md5 = hashlib.md5()
+        stat = os.stat(file_path)
+        cached = self._hash_cache.get(str(file_path.resolve()))
+        if cached and cached["mtime_ns"] == stat.st_mtime_ns and cached["size"] == stat.st_size:
+            return cached["hash"]
+
+        # file_digest lê o arquivo em blocos grandes dentro do C (sem laço Python por
+        # bloco de 4 KiB). O algoritmo continua MD5 para manter compatíveis os hashes já
+        # gravados em arquivos_processados.
         with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                hash_md5.update(chunk)
-        return hash_md5.hexdigest()
+            file_hash = hashlib.file_digest(f, "md5").hexdigest()
 
-    def list_files(self) -> List[Path]:
+        self._remember_hash(file_path, stat, file_hash)
+        return file_hash
+
+    def iter_files(self) -> Iterator[Path]:
         """
-        Lista todos os arquivos suportados na pasta de dados brutos.
+        Percorre os arquivos suportados da pasta de dados brutos, sem ordenar.
 
-        Returns:
-            Lista de caminhos dos arquivos encontrados.
+        Uma única varredura do diretório; DirEntry.is_file usa o tipo do próprio scandir.
+
+        Yields:
+            Caminho de cada arquivo encontrado.
         """
         if not self.raw_data_path.exists():
-            logger.warning(f"Pasta não encontrada: {self.raw_data_path}")
-            return []
+            logger.warning("Pasta não encontrada: {}", self.raw_data_path)
+            return
 
-        files = []
-        for ext in SUPPORTED_EXTENSIONS:
-            files.extend(self.raw_data_path.glob(f"*{ext}"))
+        with os.scandir(self.raw_data_path) as entries:
+            for entry in entries:
+                if (
+                    os.path.splitext(entry.name)[1].lower() in SUPPORTED_EXTENSIONS
+                    and entry.is_file()
+                ):
+                    yield Path(entry.path)
+
+    def list_files(self) -> List[Path]:
+        """
+        Lista todos os arquivos suportados na pasta de dados brutos.
 
-        logger.info(f"Encontrados {len(files)} arquivo(s) para processar")
-        return sorted(files)
+        Returns:
+            Lista ordenada de caminhos dos arquivos encontrados.
+        """
+        files = sorted(self.iter_files())
+        logger.info("Encontrados {} arquivo(s) para processar", len(files))
+        return files
 
     def validate_columns(
         self,
-        df: pd.DataFrame,
+        df_columns: AbstractSet[str],
         file_path: Path,
         required_columns: Optional[set] = None,
         optional_columns: Optional[set] = None,
     ) -> Tuple[bool, List[str]]:
         """
-        Valida se o DataFrame possui as colunas obrigatórias.
+        Valida se o arquivo possui as colunas obrigatórias.
 
         Args:
-            df: DataFrame a ser validado.
+            df_columns: Conjunto de colunas do DataFrame, já normalizadas.
             file_path: Caminho do arquivo (para mensagens de log).
 
         Returns:
@@ -137,70 +228,221 @@ class DataExtractor:
         """
         warnings = []
 
-        # Normalizar nomes das colunas para comparação
-        df_columns = {col.lower().strip() for col in df.columns}
+        if required_columns is None and optional_columns is None:
+            required, expected = REQUIRED_COLUMNS, _EXPECTED
+        else:
+            required = frozenset(required_columns or REQUIRED_COLUMNS)
+            expected = required | (optional_columns or OPTIONAL_COLUMNS)
 
-        # Verificar colunas obrigatórias
-        required = required_columns or REQUIRED_COLUMNS
-        optional = optional_columns or OPTIONAL_COLUMNS
+        # Uma única passada classifica as colunas ausentes em obrigatórias ou opcionais
+        missing_required = set()
+        missing_optional = set()
+        for col in expected:
+            if col not in df_columns:
+                (missing_required if col in required else missing_optional).add(col)
 
-        missing_required = required - df_columns
         if missing_required:
             return False, [f"Colunas obrigatórias ausentes: {missing_required}"]
 
-        # Verificar colunas opcionais
-        missing_optional = optional - df_columns
         if missing_optional:
             warnings.append(f"Colunas opcionais ausentes: {missing_optional}")
 
         # Verificar colunas extras (informativo)
-        expected_columns = required | optional
-        extra_columns = df_columns - expected_columns
+        extra_columns = df_columns - expected
         if extra_columns:
             warnings.append(f"Colunas extras encontradas (serão ignoradas): {extra_columns}")
 
         return True, warnings
 
-    def read_csv(self, file_path: Path) -> pd.DataFrame:
+    def _sniff_delimiter(self, file_path: Path, encoding: str) -> str:
         """
-        Lê um arquivo CSV.
+        Detecta o separador do CSV a partir de uma amostra do início do arquivo.
+
+        Se o separador já detectado na mesma pasta aparece no cabeçalho, ele é
+        reaproveitado sem passar pelo Sniffer.
+
+        Args:
+            file_path: Caminho do arquivo CSV.
+            encoding: Encoding usado para decodificar a amostra.
+
+        Returns:
+            Separador detectado (vírgula se a detecção falhar).
+        """
+        cached = self._delim_cache.get(file_path.parent)
+        with open(file_path, "r", encoding=encoding, newline="") as handle:
+            if cached is None:
+                sample = handle.read(SNIFF_SAMPLE_SIZE)
+            else:
+                header = handle.readline()
+                if cached in header:
+                    return cached
+                sample = header + handle.read(SNIFF_SAMPLE_SIZE)
+        try:
+            delimiter = csv.Sniffer().sniff(sample, delimiters=",;\t|").delimiter
+        except csv.Error:
+            return ","
+
+        self._delim_cache[file_path.parent] = delimiter
+        return delimiter
+
+    def _read_csv_arrow(self, file_path: Path, encoding: str, delimiter: str) -> "pd.DataFrame":
+        """
+        Lê o CSV com o parser multithread do pyarrow.
 
         Args:
             file_path: Caminho do arquivo CSV.
+            encoding: Encoding do arquivo.
+            delimiter: Separador de colunas.
 
         Returns:
             DataFrame com os dados do arquivo.
         """
-        # Tenta diferentes encodings comuns (utf-8-sig trata BOM automaticamente)
-        encodings = ["utf-8-sig", "utf-8", "latin-1", "cp1252", "iso-8859-1"]
-
-        for encoding in encodings:
-            try:
-                df = pd.read_csv(
-                    file_path,
-                    encoding=encoding,
-                    sep=None,  # Detecta separador automaticamente
-                    engine="python",
-                    on_bad_lines="warn",
-                )
-                logger.debug(f"Arquivo lido com encoding: {encoding}")
-                return df
-            except UnicodeDecodeError:
-                continue
-            except Exception as e:
-                logger.debug(f"Erro com encoding {encoding}: {e}")
-                continue
-
-        # Se nenhum encoding funcionar, tenta com errors='replace'
+        from pyarrow import csv as pacsv
+
+        table = pacsv.read_csv(
+            file_path,
+            read_options=pacsv.ReadOptions(encoding=_arrow_encoding(encoding), use_threads=True),
+            parse_options=_arrow_parse_options(file_path, delimiter),
+            convert_options=_arrow_convert_options(),
+        )
+        return _arrow_to_pandas(table)
+
+    def _iter_csv_chunks(
+        self,
+        file_path: Path,
+        encoding: str,
+        delimiter: str,
+        header: List[str],
+        file_hash: str,
+        block_size: int,
+    ) -> Iterator["pd.DataFrame"]:
+        """
+        Lê o CSV bloco a bloco com o leitor em streaming do pyarrow.
+
+        Todas as colunas são lidas como texto: o leitor em streaming infere tipos só
+        no primeiro bloco, e a conversão de tipos já é feita na transformação.
+
+        Args:
+            file_path: Caminho do arquivo CSV.
+            encoding: Encoding do arquivo.
+            delimiter: Separador de colunas.
+            header: Nomes das colunas (como estão no arquivo).
+            file_hash: Hash do arquivo, anexado a cada bloco.
+            block_size: Tamanho de cada bloco em bytes.
+
+        Yields:
+            DataFrame de cada bloco, com colunas normalizadas e metadados.
+        """
+        import pyarrow as pa
+        from pyarrow import csv as pacsv
+
+        reader = pacsv.open_csv(
+            file_path,
+            read_options=pacsv.ReadOptions(
+                encoding=_arrow_encoding(encoding), block_size=block_size
+            ),
+            parse_options=_arrow_parse_options(file_path, delimiter),
+            convert_options=_arrow_convert_options(
+                column_types={name: pa.string() for name in header}
+            ),
+        )
+        for batch in reader:
+            df = _arrow_to_pandas(pa.Table.from_batches([batch]))
+            df.columns = df.columns.str.lower().str.strip()
+            df["_arquivo_origem"] = _constant_category(file_path.name, len(df))
+            df["_arquivo_hash"] = _constant_category(file_hash, len(df))
+            yield df
+
+    def detect_encoding(self, file_path: Path) -> str:
+        """
+        Detecta o encoding do arquivo a partir de uma amostra do início.
+
+        Args:
+            file_path: Caminho do arquivo.
+
+        Returns:
+            Nome do encoding (utf-8-sig para UTF-8/ASCII, preservando o BOM).
+        """
+        with open(file_path, "rb") as handle:
+            head = handle.read(SNIFF_SAMPLE_SIZE)
+
+        from charset_normalizer import from_bytes
+
+        match = from_bytes(head).best()
+        encoding = match.encoding if match else "utf_8"
+        if encoding in ("utf_8", "ascii"):
+            return "utf-8-sig"
+        return encoding
+
+    def _parse_csv(self, file_path: Path, encoding: str) -> "pd.DataFrame":
+        """
+        Faz o parse do CSV com um encoding já definido.
+
+        Usa o parser do pyarrow; se ele não interpretar o arquivo, tenta o engine C
+        do pandas com o separador detectado e, por último, o engine python com
+        detecção automática de separador.
+
+        Args:
+            file_path: Caminho do arquivo CSV.
+            encoding: Encoding do arquivo.
+
+        Returns:
+            DataFrame com os dados do arquivo.
+        """
+        import pandas as pd
+        import pyarrow as pa
+
+        delimiter = self._sniff_delimiter(file_path, encoding)
+        try:
+            return self._read_csv_arrow(file_path, encoding, delimiter)
+        except pa.ArrowInvalid as e:
+            logger.debug("pyarrow não leu {} ({}): {}", file_path.name, encoding, e)
+
+        try:
+            return pd.read_csv(
+                file_path, encoding=encoding, sep=delimiter, engine="c", on_bad_lines="warn"
+            )
+        except UnicodeDecodeError:
+            raise
+        except ValueError as e:
+            logger.debug("Engine C do pandas não leu {} ({}): {}", file_path.name, encoding, e)
+
         return pd.read_csv(
             file_path,
-            encoding="utf-8-sig",
-            errors="replace",
-            sep=None,
+            encoding=encoding,
+            sep=None,  # Detecta separador automaticamente
             engine="python",
+            on_bad_lines="warn",
         )
 
-    def read_excel(self, file_path: Path) -> pd.DataFrame:
+    def read_csv(self, file_path: Path) -> "pd.DataFrame":
+        """
+        Lê um arquivo CSV.
+
+        O encoding é detectado uma única vez numa amostra do arquivo, evitando
+        reler o arquivo inteiro para cada encoding candidato.
+
+        Args:
+            file_path: Caminho do arquivo CSV.
+
+        Returns:
+            DataFrame com os dados do arquivo.
+        """
+        encoding = self.detect_encoding(file_path)
+        try:
+            df = self._parse_csv(file_path, encoding)
+        except UnicodeDecodeError:
+            # A amostra não representava o arquivo todo; latin-1 decodifica qualquer byte
+            logger.warning(
+                "Encoding {} inválido em {}, relendo como latin-1", encoding, file_path.name
+            )
+            encoding = "latin-1"
+            df = self._parse_csv(file_path, encoding)
+
+        logger.debug("Arquivo lido com encoding: {}", encoding)
+        return df
+
+    def read_excel(self, file_path: Path) -> "pd.DataFrame":
         """
         Lê um arquivo Excel (.xlsx ou .xls).
 
@@ -210,8 +452,9 @@ class DataExtractor:
         Returns:
             DataFrame com os dados do arquivo.
         """
-        engine = "openpyxl" if file_path.suffix == ".xlsx" else "xlrd"
-        return pd.read_excel(file_path, engine=engine)
+        import pandas as pd
+
+        return pd.read_excel(file_path, engine=_excel_engine(file_path.suffix.lower()))
 
     def extract_file(
         self,
@@ -228,7 +471,7 @@ class DataExtractor:
         Returns:
             ExtractionResult com os dados extraídos ou informações de erro.
         """
-        logger.info(f"Extraindo arquivo: {file_path.name}")
+        logger.info("Extraindo arquivo: {}", file_path.name)
 
         # Verificar se o arquivo existe
         if not file_path.exists():
@@ -247,21 +490,25 @@ class DataExtractor:
             )
 
         try:
-            # Calcular hash do arquivo
-            file_hash = self.calculate_file_hash(file_path)
+            # Hash e leitura em paralelo: o MD5 e os parsers liberam o GIL, e a
+            # segunda leitura do arquivo aproveita o page cache aquecido pela primeira
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                hash_future = executor.submit(self.calculate_file_hash, file_path)
 
-            # Ler arquivo de acordo com a extensão
-            if file_path.suffix.lower() == ".csv":
-                df = self.read_csv(file_path)
-            else:
-                df = self.read_excel(file_path)
+                # Ler arquivo de acordo com a extensão
+                if file_path.suffix.lower() == ".csv":
+                    df = self.read_csv(file_path)
+                else:
+                    df = self.read_excel(file_path)
+
+                file_hash = hash_future.result()
 
             # Normalizar nomes das colunas
             df.columns = df.columns.str.lower().str.strip()
 
             # Validar estrutura
             is_valid, warnings = self.validate_columns(
-                df,
+                set(df.columns),
                 file_path,
                 required_columns=required_columns,
                 optional_columns=optional_columns,
@@ -274,11 +521,11 @@ class DataExtractor:
                     error_message=warnings[0] if warnings else "Estrutura inválida",
                 )
 
-            # Adicionar metadados
-            df["_arquivo_origem"] = file_path.name
-            df["_arquivo_hash"] = file_hash
+            # Adicionar metadados (categóricos: um único valor + códigos int8 por linha)
+            df["_arquivo_origem"] = _constant_category(file_path.name, len(df))
+            df["_arquivo_hash"] = _constant_category(file_hash, len(df))
 
-            logger.success(f"Extraído com sucesso: {len(df)} registros de {file_path.name}")
+            logger.success("Extraído com sucesso: {} registros de {}", len(df), file_path.name)
 
             return ExtractionResult(
                 success=True,
@@ -290,7 +537,86 @@ class DataExtractor:
             )
 
         except Exception as e:
-            logger.error(f"Erro ao extrair {file_path.name}: {str(e)}")
+            logger.error("Erro ao extrair {}: {}", file_path.name, e)
+            return ExtractionResult(
+                success=False,
+                file_path=str(file_path),
+                error_message=str(e),
+            )
+
+    def extract_file_chunks(
+        self,
+        file_path: Path,
+        required_columns: Optional[set] = None,
+        optional_columns: Optional[set] = None,
+        block_size: int = CHUNK_BLOCK_SIZE,
+    ) -> ExtractionResult:
+        """
+        Prepara a extração em blocos de um CSV grande.
+
+        Valida o cabeçalho e calcula o hash de imediato; os dados só são lidos ao
+        consumir ExtractionResult.dataframe_iter, mantendo o pico de memória no
+        tamanho de um bloco em vez do arquivo inteiro.
+
+        Args:
+            file_path: Caminho do arquivo CSV.
+            required_columns: Colunas obrigatórias (padrão: REQUIRED_COLUMNS).
+            optional_columns: Colunas opcionais (padrão: OPTIONAL_COLUMNS).
+            block_size: Tamanho de cada bloco em bytes.
+
+        Returns:
+            ExtractionResult com dataframe_iter preenchido (records_count fica 0).
+        """
+        file_path = Path(file_path)
+        logger.info("Extraindo em blocos: {}", file_path.name)
+
+        if not file_path.exists():
+            return ExtractionResult(
+                success=False,
+                file_path=str(file_path),
+                error_message=f"Arquivo não encontrado: {file_path}",
+            )
+
+        if file_path.suffix.lower() != ".csv":
+            return ExtractionResult(
+                success=False,
+                file_path=str(file_path),
+                error_message=f"Leitura em blocos disponível apenas para CSV: {file_path.name}",
+            )
+
+        try:
+            file_hash = self.calculate_file_hash(file_path)
+            encoding = self.detect_encoding(file_path)
+            delimiter = self._sniff_delimiter(file_path, encoding)
+            with open(file_path, "r", encoding=encoding, newline="") as handle:
+                header = next(csv.reader(handle, delimiter=delimiter), [])
+
+            is_valid, warnings = self.validate_columns(
+                {col.lower().strip() for col in header},
+                file_path,
+                required_columns=required_columns,
+                optional_columns=optional_columns,
+            )
+            if not is_valid:
+                return ExtractionResult(
+                    success=False,
+                    file_path=str(file_path),
+                    file_hash=file_hash,
+                    error_message=warnings[0] if warnings else "Estrutura inválida",
+                )
+
+            return ExtractionResult(
+                success=True,
+                file_path=str(file_path),
+                file_hash=file_hash,
+                warnings=warnings,
+                dataframe_iter=self._iter_csv_chunks(
+                    file_path, encoding, delimiter, header, file_hash, block_size
+                ),
+            )
+
+        except Exception as e:
+            logger.error("Erro ao extrair {}: {}", file_path.name, e)
             return ExtractionResult(
                 success=False,
                 file_path=str(file_path),
@@ -305,24 +631,183 @@ class DataExtractor:
             Lista de ExtractionResult para cada arquivo processado.
         """
         files = self.list_files()
-        results = []
 
-        for file_path in files:
-            result = self.extract_file(file_path)
-            results.append(result)
+        # Cada arquivo é independente (hash + parse): com mais de um, distribui entre
+        # processos; ex.map preserva a ordem de list_files
+        if len(files) < 2:
+            results = [self.extract_file(file_path) for file_path in files]
+        else:
+            max_workers = min(len(files), os.cpu_count() or 1)
+            with ProcessPoolExecutor(
+                max_workers=max_workers,
+                initializer=_init_worker,
+                initargs=(self.raw_data_path,),
+            ) as executor:
+                results = list(executor.map(_extract_one, files))
+
+            # Os workers têm cache próprio; os hashes calculados voltam pelo resultado
+            for file_path, result in zip(files, results):
+                if result.file_hash:
+                    self._remember_hash(file_path, os.stat(file_path), result.file_hash)
+
+        self.save_hash_cache()
 
         # Resumo
         success_count = sum(1 for r in results if r.success)
         total_records = sum(r.records_count for r in results if r.success)
 
         logger.info(
-            f"Extração concluída: {success_count}/{len(results)} arquivos, "
-            f"{total_records} registros no total"
+            "Extração concluída: {}/{} arquivos, {} registros no total",
+            success_count,
+            len(results),
+            total_records,
         )
 
         return results
 
 
+def _arrow_encoding(encoding: str) -> str:
+    """Converte o nome do encoding para o pyarrow (que já descarta o BOM em UTF-8)."""
+    return "utf8" if encoding in ("utf-8-sig", "utf-8") else encoding
+
+
+def _arrow_parse_options(file_path: Path, delimiter: str) -> "pacsv.ParseOptions":
+    """
+    Monta as opções de parse do pyarrow, ignorando (com aviso) linhas inválidas.
+
+    Args:
+        file_path: Caminho do arquivo (para mensagens de log).
+        delimiter: Separador de colunas.
+
+    Returns:
+        ParseOptions do pyarrow.
+    """
+    from pyarrow import csv as pacsv
+
+    def _skip_invalid_row(row) -> str:
+        logger.warning("Linha inválida ignorada em {}: {}", file_path.name, row.text)
+        return "skip"
+
+    return pacsv.ParseOptions(delimiter=delimiter, invalid_row_handler=_skip_invalid_row)
+
+
+def _arrow_convert_options(**kwargs) -> "pacsv.ConvertOptions":
+    """
+    Monta as opções de conversão do pyarrow com nulos equivalentes aos do pandas.
+
+    Por padrão o pyarrow mantém campos vazios de colunas de texto como "" (e não
+    nulo); aqui eles viram nulos, como no ``pd.read_csv``, para que o tratamento
+    de nulos da transformação descarte linhas sem campos obrigatórios.
+
+    Args:
+        **kwargs: Demais opções de ``ConvertOptions`` (ex.: column_types).
+
+    Returns:
+        ConvertOptions do pyarrow.
+    """
+    from pyarrow import csv as pacsv
+
+    return pacsv.ConvertOptions(strings_can_be_null=True, quoted_strings_can_be_null=True, **kwargs)
+
+
+def _arrow_to_pandas(table: "pa.Table") -> "pd.DataFrame":
+    """
+    Converte uma tabela Arrow em DataFrame.
+
+    Texto repetitivo vira dicionário no Arrow e Categorical no pandas (códigos
+    inteiros + valores únicos) em vez de um objeto Python por linha.
+
+    Args:
+        table: Tabela lida pelo pyarrow.
+
+    Returns:
+        DataFrame com as colunas de CATEGORY_COLUMNS categóricas.
+    """
+    import pyarrow as pa
+
+    for i, name in enumerate(table.column_names):
+        column = table.column(i)
+        if name.lower().strip() in CATEGORY_COLUMNS and pa.types.is_string(column.type):
+            table = table.set_column(i, name, column.dictionary_encode())
+
+    return table.to_pandas()
+
+
+@lru_cache(maxsize=None)
+def _excel_engine(suffix: str) -> str:
+    """
+    Escolhe o engine do pandas para um tipo de planilha, sem importar o pacote.
+
+    calamine (Rust) lê .xlsx e .xls; openpyxl (.xlsx) e xlrd (.xls) ficam como
+    alternativa. A busca só acontece ao encontrar a primeira planilha do tipo.
+
+    Args:
+        suffix: Extensão do arquivo em minúsculas (.xlsx ou .xls).
+
+    Returns:
+        Nome do engine para pd.read_excel.
+
+    Raises:
+        ImportError: Se nenhum leitor para o tipo de planilha estiver instalado.
+    """
+    if find_spec("python_calamine") is not None:
+        return "calamine"
+
+    module = "openpyxl" if suffix == ".xlsx" else "xlrd"
+    if find_spec(module) is None:
+        raise ImportError(
+            f"Nenhum leitor disponível para arquivos {suffix}: instale python-calamine ou {module}"
+        )
+    return module
+
+
+def _constant_category(value: str, length: int) -> "pd.Categorical":
+    """
+    Cria uma coluna categórica com o mesmo valor em todas as linhas.
+
+    Args:
+        value: Valor repetido.
+        length: Quantidade de linhas.
+
+    Returns:
+        Categorical com uma única categoria.
+    """
+    import numpy as np
+    import pandas as pd
+
+    return pd.Categorical.from_codes(np.zeros(length, dtype=np.int8), categories=[value])
+
+
+# Extrator único de cada processo do pool (criado uma vez em _init_worker)
+_worker_extractor: Optional[DataExtractor] = None
+
+
+def _init_worker(raw_data_path: Path) -> None:
+    """
+    Inicializa um processo do pool de extract_all.
+
+    Args:
+        raw_data_path: Pasta de dados brutos do extrator principal.
+    """
+    global _worker_extractor
+    _worker_extractor = DataExtractor(raw_data_path=raw_data_path)
+
+
+def _extract_one(file_path: Path) -> ExtractionResult:
+    """
+    Extrai um arquivo em um processo do pool de extract_all.
+
+    Args:
+        file_path: Caminho do arquivo a ser extraído.
+
+    Returns:
+        ExtractionResult do arquivo.
+    """
+    if _worker_extractor is None:
+        _init_worker(file_path.parent)
+    return _worker_extractor.extract_file(file_path)
+
+
 def extract(file_path: Optional[str] = None) -> List[ExtractionResult]:
     """
     Função principal de extração.
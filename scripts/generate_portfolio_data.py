@@ -1,13 +1,15 @@
 import argparse
-import csv
+import os
 import random
+import shutil
 import sys
-from bisect import bisect
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Sequence, TypeVar
+from typing import Callable, Sequence, TypeVar
 
-from faker import Faker
+import numpy as np
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
@@ -128,28 +130,93 @@ def _build_catalog_rows():
 
 T = TypeVar("T")
 
+# Buffer dos arquivos de saída (bytes): menos chamadas de write ao sistema
+WRITE_BUFFER_SIZE = 1 << 20
 
-def _build_cdf(weights: list[float]) -> list[float]:
-    total = sum(weights)
-    cdf = []
-    acc = 0.0
-    for w in weights:
-        acc += w
-        cdf.append(acc / total)
+
+def csv_field(value: str) -> str:
+    # Mesmo escape do csv.writer (QUOTE_MINIMAL) para textos com separador ou aspas
+    if any(ch in value for ch in ',"\r\n'):
+        return '"' + value.replace('"', '""') + '"'
+    return value
+
+
+def write_lines(handle, lines: list[str]) -> None:
+    if lines:
+        handle.write("".join(lines).encode("utf-8"))
+        lines.clear()
+
+
+def _build_cdf(weights: Sequence[float]) -> np.ndarray:
+    cdf = np.cumsum(np.asarray(weights, dtype=np.float64))
+    cdf /= cdf[-1]
     return cdf
 
 
-def _pick_from_cdf(options: Sequence[T], cdf: list[float]) -> T:
-    r = random.random()
-    idx = bisect(cdf, r)
-    return options[idx]
+def build_client_names(size: int, synthetic: bool = False) -> list[str]:
+    # Nomes sintéticos dispensam o Faker (import e geração lentos) em testes de carga
+    if synthetic:
+        return [f"Cliente {i:06d}" for i in range(1, size + 1)]
 
+    from faker import Faker
 
-def _jitter_weights(weights: list[float], min_factor: float, max_factor: float) -> list[float]:
-    return [w * random.uniform(min_factor, max_factor) for w in weights]
+    fake = Faker("pt_BR")
+    return [fake.name() for _ in range(size)]
 
 
-def _build_date_cdf(start_date: datetime, end_date: datetime) -> tuple[list[datetime], list[float]]:
+def build_alias(weights: Sequence[float]) -> tuple[list[float], list[int]]:
+    # Tabela de alias (Walker/Vose): cada sorteio ponderado vira um índice uniforme,
+    # uma comparação e, às vezes, um desvio para o alias — O(1) em vez de O(log n)
+    n = len(weights)
+    total = sum(weights)
+    prob = [w * n / total for w in weights]
+    alias = list(range(n))
+    small = [i for i, p in enumerate(prob) if p < 1.0]
+    large = [i for i, p in enumerate(prob) if p >= 1.0]
+    while small and large:
+        menor = small.pop()
+        maior = large.pop()
+        alias[menor] = maior
+        prob[maior] += prob[menor] - 1.0
+        (small if prob[maior] < 1.0 else large).append(maior)
+    for i in small + large:
+        prob[i] = 1.0
+    return prob, alias
+
+
+def pick_alias(
+    options: Sequence[T],
+    prob: Sequence[float],
+    alias: Sequence[int],
+    rand: Callable[[], float] = random.random,
+) -> T:
+    i = int(len(options) * rand())
+    return options[i] if rand() < prob[i] else options[alias[i]]
+
+
+def _sample_alias(
+    rng: np.random.Generator, prob: Sequence[float], alias: Sequence[int], size: int
+) -> np.ndarray:
+    prob_arr = np.asarray(prob)
+    i = rng.integers(0, len(prob_arr), size)
+    return np.where(rng.random(size) < prob_arr[i], i, np.asarray(alias)[i])
+
+
+def _sample_cdf(rng: np.random.Generator, cdf: np.ndarray, size: int) -> np.ndarray:
+    # Mesmo critério do bisect (side="right"), em lote; o teto é só uma salvaguarda
+    idx = np.searchsorted(cdf, rng.random(size), side="right")
+    return np.minimum(idx, len(cdf) - 1)
+
+
+def _jitter_weights(
+    rng: np.random.Generator, weights: list[float], min_factor: float, max_factor: float
+) -> np.ndarray:
+    return np.asarray(weights) * rng.uniform(min_factor, max_factor, len(weights))
+
+
+def _build_date_weights(
+    rng: np.random.Generator, start_date: datetime, end_date: datetime
+) -> tuple[list[datetime], np.ndarray]:
     month_base = [
         0.75,
         0.85,
@@ -166,50 +233,263 @@ def _build_date_cdf(start_date: datetime, end_date: datetime) -> tuple[list[date
     ]
     dow_base = [1.35, 1.2, 1.0, 1.0, 1.3, 0.6, 0.35]
 
-    month_weights = _jitter_weights(month_base, 0.85, 1.25)
-    dow_weights = _jitter_weights(dow_base, 0.8, 1.3)
+    month_weights = _jitter_weights(rng, month_base, 0.85, 1.25)
+    dow_weights = _jitter_weights(rng, dow_base, 0.8, 1.3)
 
     total_days = (end_date - start_date).days
-    eventos = []
+    dates = [start_date + timedelta(days=i) for i in range(total_days + 1)]
+
+    # Pesos de todos os dias de uma vez: mês e dia da semana indexam as tabelas
+    dias = np.arange(total_days + 1)
+    meses = np.fromiter((d.month - 1 for d in dates), dtype=np.int64, count=len(dates))
+    dows = (start_date.weekday() + dias) % 7
+    trend = 0.8 + 0.5 * (dias / total_days if total_days > 0 else 0.0)
+    weights = month_weights[meses] * dow_weights[dows] * trend
+
+    # Eventos sazonais: um boost multiplicado na janela [offset, offset + duracao]
     if total_days > 60:
-        for _ in range(random.randint(4, 7)):
-            offset = random.randint(0, max(1, total_days - 30))
-            duracao = random.randint(10, 28)
-            inicio = start_date + timedelta(days=offset)
-            fim = inicio + timedelta(days=duracao)
-            boost = random.uniform(1.15, 1.6)
-            eventos.append((inicio, fim, boost))
-    dates: list[datetime] = []
-    weights: list[float] = []
-    for i in range(total_days + 1):
-        day = start_date + timedelta(days=i)
-        progress = i / total_days if total_days > 0 else 0
-        trend = 0.8 + (0.5 * progress)
-        weight = month_weights[day.month - 1] * dow_weights[day.weekday()] * trend
-        if eventos:
-            for inicio, fim, boost in eventos:
-                if inicio <= day <= fim:
-                    weight *= boost
-        weight *= random.uniform(0.9, 1.1)
-        dates.append(day)
-        weights.append(weight)
-
-    return dates, _build_cdf(weights)
-
-
-def generate_dataset(rows: int, years: int, output_dir: Path, seed: int | None = None):
-    if seed is not None:
-        random.seed(seed)
+        for _ in range(rng.integers(4, 8)):
+            offset = int(rng.integers(0, max(1, total_days - 30) + 1))
+            duracao = int(rng.integers(10, 29))
+            boost = rng.uniform(1.15, 1.6)
+            weights[offset : offset + duracao + 1] *= boost
+
+    weights *= rng.uniform(0.9, 1.1, len(weights))
+    return dates, weights
+
+
+# Faixas do sorteio da quantidade de itens: 55% com 1, 30% com 2, 12% com 3 e 3% com 4
+ITENS_LIMITES = np.array([0.55, 0.85, 0.97])
+
+
+def _fill_rows(
+    rng: np.random.Generator,
+    produto_idx: np.ndarray,
+    is_acessorio: np.ndarray,
+    acessorios_idx: np.ndarray,
+    produtos_alias: tuple[list[float], list[int]],
+    preco_min: np.ndarray,
+    preco_max: np.ndarray,
+) -> tuple[np.ndarray, ...]:
+    # Montagem numérica de um bloco de transações em arrays: quantidade de itens,
+    # produtos extras, quantidades, preços e totais, sem laço Python por item
+    n = len(produto_idx)
+    itens_count = np.searchsorted(ITENS_LIMITES, rng.random(n), side="right").astype(np.int8)
+    itens_count += 1
+
+    # Itens em sequência por transação; o primeiro de cada uma é o produto principal
+    item_trans = np.repeat(np.arange(n), itens_count)
+    total_itens = len(item_trans)
+    principal = np.zeros(total_itens, dtype=bool)
+    principal[np.cumsum(itens_count) - itens_count] = True
+
+    item_produto = np.empty(total_itens, dtype=np.int64)
+    item_produto[principal] = produto_idx
+    extras = ~principal
+    n_extras = int(extras.sum())
+    usa_acessorio = ~is_acessorio[produto_idx[item_trans[extras]]] & (rng.random(n_extras) < 0.6)
+    item_produto[extras] = np.where(
+        usa_acessorio,
+        acessorios_idx[rng.integers(0, len(acessorios_idx), n_extras)],
+        _sample_alias(rng, *produtos_alias, n_extras),
+    )
+
+    quantidade = np.where(rng.random(total_itens) < 0.8, 1, rng.integers(2, 4, total_itens))
+    faixa = preco_max[item_produto] - preco_min[item_produto]
+    valor_unitario = preco_min[item_produto] + rng.random(total_itens) * faixa
+    # Só o total do item é arredondado (em lote, no próprio buffer): a transação soma os
+    # centavos exatos de seus itens; o valor unitário é arredondado apenas na formatação
+    valor_item = valor_unitario * quantidade
+    np.round(valor_item, 2, out=valor_item)
+    valor_transacao = np.bincount(item_trans, weights=valor_item, minlength=n)
+    return itens_count, item_produto, quantidade, valor_unitario, valor_item, valor_transacao
+
+
+def _payment_idx(
+    rng: np.random.Generator,
+    data_idx: np.ndarray,
+    status_idx: np.ndarray,
+    pago: int,
+    atrasado: int,
+    ultima_data: int,
+) -> np.ndarray:
+    # Índice da data de pagamento em datas_str (-1 = sem pagamento): pagas em até 15
+    # dias (limitado ao último dia); 35% das atrasadas pagas entre 20 e 60 dias depois
+    pagamento = np.full(len(data_idx), -1, dtype=np.int64)
+
+    pagas = status_idx == pago
+    offsets = rng.integers(0, 16, int(pagas.sum()))
+    pagamento[pagas] = np.minimum(data_idx[pagas] + offsets, ultima_data)
+
+    atrasadas = (status_idx == atrasado) & (rng.random(len(data_idx)) < 0.35)
+    candidatos = data_idx[atrasadas] + rng.integers(20, 61, int(atrasadas.sum()))
+    pagamento[atrasadas] = np.where(candidatos <= ultima_data, candidatos, -1)
+    return pagamento
+
+
+# Linhas por bloco vetorizado (e granularidade da divisão em shards)
+CHUNK_ROWS = 20000
+
+
+@dataclass(slots=True)
+class _ShardContext:
+    # Tabelas somente leitura usadas por todos os shards (enviadas uma vez por processo)
+    produtos_alias: tuple[list[float], list[int]]
+    clientes_alias: tuple[list[float], list[int]]
+    datas_alias: tuple[list[float], list[int]]
+    status_options: list[str]
+    status_cdfs: list[np.ndarray]
+    status_grupo_produto: np.ndarray
+    categorias_produto: list[str]
+    produtos_csv: list[str]
+    clientes_csv: list[str]
+    datas_str: list[str]
+    is_acessorio: np.ndarray
+    acessorios_idx: np.ndarray
+    preco_min: np.ndarray
+    preco_max: np.ndarray
+
+
+# Contexto de cada processo (definido uma vez em _init_shard_worker)
+_shard_context: _ShardContext | None = None
+
+
+def _init_shard_worker(context: _ShardContext) -> None:
+    global _shard_context
+    _shard_context = context
+
+
+def _write_shard(
+    inicio: int,
+    fim: int,
+    seeds: list[np.random.SeedSequence],
+    transacoes_path: Path,
+    itens_path: Path,
+) -> int:
+    # Gera as transações [inicio, fim) e anexa as linhas, sem cabeçalho, aos arquivos;
+    # seeds traz uma semente por bloco da faixa, na ordem dos blocos
+    ctx = _shard_context
+
+    status_pago = ctx.status_options.index("pago")
+    status_atrasado = ctx.status_options.index("atrasado")
+    ultima_data = len(ctx.datas_str) - 1
+
+    # Colunas de texto como arrays de objetos: cada coluna de um bloco sai de um único
+    # take; o índice -1 (sem pagamento) cai no texto vazio ao final de pagamentos
+    produtos = np.array(ctx.produtos_csv, dtype=object)
+    categorias = np.array(ctx.categorias_produto, dtype=object)
+    clientes = np.array(ctx.clientes_csv, dtype=object)
+    status_options = np.array(ctx.status_options, dtype=object)
+    datas = np.array(ctx.datas_str, dtype=object)
+    pagamentos = np.array(ctx.datas_str + [""], dtype=object)
+
+    with open(transacoes_path, "ab", buffering=WRITE_BUFFER_SIZE) as trans_file, open(
+        itens_path, "ab", buffering=WRITE_BUFFER_SIZE
+    ) as itens_file:
+        # Cada bloco sorteia e calcula suas colunas em arrays; o Python só formata as linhas
+        for bloco in range(inicio, fim, CHUNK_ROWS):
+            n = min(CHUNK_ROWS, fim - bloco)
+            rng = np.random.default_rng(seeds[(bloco - inicio) // CHUNK_ROWS])
+
+            produto_idx = _sample_alias(rng, *ctx.produtos_alias, n)
+            cliente_idx = _sample_alias(rng, *ctx.clientes_alias, n)
+            data_idx = _sample_alias(rng, *ctx.datas_alias, n)
+
+            status_grupo = ctx.status_grupo_produto[produto_idx]
+            status_idx = np.empty(n, dtype=np.int64)
+            for grupo, cdf in enumerate(ctx.status_cdfs):
+                mask = status_grupo == grupo
+                status_idx[mask] = _sample_cdf(rng, cdf, int(mask.sum()))
+
+            (
+                itens_count,
+                item_produto,
+                quantidade,
+                valor_unitario,
+                valor_item,
+                valor_transacao,
+            ) = _fill_rows(
+                rng,
+                produto_idx,
+                ctx.is_acessorio,
+                ctx.acessorios_idx,
+                ctx.produtos_alias,
+                ctx.preco_min,
+                ctx.preco_max,
+            )
+            pagamento_idx = _payment_idx(
+                rng, data_idx, status_idx, status_pago, status_atrasado, ultima_data
+            )
+
+            # IDs do bloco formatados de uma vez; cada um é repetido nas linhas de seus itens
+            ids = np.array(
+                [f"TRX-PORT-{idx:09d}" for idx in range(bloco + 1, bloco + n + 1)], dtype=object
+            )
+
+            # Colunas convertidas em listas Python (evita boxing de escalares NumPy no zip)
+            trans_chunk = [
+                f"{trx},{data},{cliente},{produto},{categoria},{valor:.2f},{status},{pagamento}\n"
+                for trx, data, cliente, produto, categoria, valor, status, pagamento in zip(
+                    ids.tolist(),
+                    datas[data_idx].tolist(),
+                    clientes[cliente_idx].tolist(),
+                    produtos[produto_idx].tolist(),
+                    categorias[produto_idx].tolist(),
+                    valor_transacao.tolist(),
+                    status_options[status_idx].tolist(),
+                    pagamentos[pagamento_idx].tolist(),
+                )
+            ]
+            itens_chunk = [
+                f"{trx},{produto},{qtd},{unitario:.2f},{total:.2f}\n"
+                for trx, produto, qtd, unitario, total in zip(
+                    np.repeat(ids, itens_count).tolist(),
+                    produtos[item_produto].tolist(),
+                    quantidade.tolist(),
+                    valor_unitario.tolist(),
+                    valor_item.tolist(),
+                )
+            ]
+
+            write_lines(trans_file, trans_chunk)
+            write_lines(itens_file, itens_chunk)
+            if (bloco + n) % 200000 == 0:
+                print(f"Gerados {bloco + n} registros...")
+
+    return fim - inicio
+
+
+def _concat_parts(destino: Path, partes: list[Path]) -> None:
+    with open(destino, "ab") as saida:
+        for parte in partes:
+            with open(parte, "rb") as entrada:
+                shutil.copyfileobj(entrada, saida, WRITE_BUFFER_SIZE)
+            parte.unlink()
+
+
+def generate_dataset(
+    rows: int,
+    years: int,
+    output_dir: Path,
+    seed: int | None = None,
+    synthetic_names: bool = False,
+    workers: int = 1,
+):
+    seed_seq = np.random.SeedSequence(seed)
+    rng = np.random.default_rng(seed_seq)
 
-    fake = Faker("pt_BR")
     catalog_rows = _build_catalog_rows()
 
+    # Catálogo em colunas (SoA) indexadas pelo índice do produto
     produtos = [r["produto"] for r in catalog_rows]
-    pesos = [r["peso"] for r in catalog_rows]
-    pesos = [max(1, int(p * random.uniform(0.7, 1.35))) for p in pesos]
-    produtos_cdf = _build_cdf(pesos)
-    produto_map = {r["produto"]: r for r in catalog_rows}
-    acessorios = [r["produto"] for r in catalog_rows if r["categoria"] == "Acessorios"]
+    categorias_produto = [r["categoria"] for r in catalog_rows]
+    preco_min = np.array([r["preco_min"] for r in catalog_rows], dtype=np.float64)
+    preco_max = np.array([r["preco_max"] for r in catalog_rows], dtype=np.float64)
+    is_acessorio = np.array([c == "Acessorios" for c in categorias_produto])
+    acessorios_idx = np.flatnonzero(is_acessorio)
+
+    pesos = np.array([r["peso"] for r in catalog_rows]) * rng.uniform(0.7, 1.35, len(produtos))
+    produtos_alias = build_alias(np.maximum(1, pesos.astype(np.int64)).tolist())
 
     output_dir.mkdir(parents=True, exist_ok=True)
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -219,38 +499,25 @@ def generate_dataset(rows: int, years: int, output_dir: Path, seed: int | None =
     itens_path = output_dir / f"transacao_itens_{rows}_{timestamp}.csv"
 
     # Catálogo
-    with catalog_path.open("w", newline="", encoding="utf-8") as catalog_file:
-        writer = csv.writer(catalog_file)
-        writer.writerow(
-            [
-                "categoria",
-                "categoria_descricao",
-                "produto",
-                "descricao",
-                "preco_base",
-                "preco_min",
-                "preco_max",
-                "ativo",
-            ]
+    linhas_catalogo = [
+        f"{r['categoria']},{csv_field(r['categoria_descricao'])},{csv_field(r['produto'])},"
+        f"{csv_field(r['descricao'])},{r['preco_base']:.2f},{r['preco_min']:.2f},"
+        f"{r['preco_max']:.2f},True\n"
+        for r in catalog_rows
+    ]
+    with open(catalog_path, "wb") as catalog_file:
+        catalog_file.write(
+            (
+                "categoria,categoria_descricao,produto,descricao,preco_base,preco_min,"
+                "preco_max,ativo\n" + "".join(linhas_catalogo)
+            ).encode("utf-8")
         )
-        for row in catalog_rows:
-            writer.writerow(
-                [
-                    row["categoria"],
-                    row["categoria_descricao"],
-                    row["produto"],
-                    row["descricao"],
-                    f"{row['preco_base']:.2f}",
-                    f"{row['preco_min']:.2f}",
-                    f"{row['preco_max']:.2f}",
-                    True,
-                ]
-            )
 
     # Clientes
-    clientes = [fake.name() for _ in range(60000)]
-    cliente_pesos = [max(1, int(random.paretovariate(1.25) * 10)) for _ in clientes]
-    clientes_cdf = _build_cdf(cliente_pesos)
+    clientes = build_client_names(60000, synthetic_names)
+    # Pareto com mínimo 1 (mesma forma do random.paretovariate): Lomax + 1
+    cliente_pesos = (rng.pareto(1.25, len(clientes)) + 1) * 10
+    clientes_alias = build_alias(np.maximum(1, cliente_pesos.astype(np.int64)).tolist())
 
     status_options = ["pago", "pendente", "atrasado", "cancelado", "erro"]
     status_cdfs = {
@@ -261,123 +528,90 @@ def generate_dataset(rows: int, years: int, output_dir: Path, seed: int | None =
 
     end_date = datetime.now()
     start_date = end_date - timedelta(days=years * 365)
-    datas_candidatas, datas_cdf = _build_date_cdf(start_date, end_date)
-
-    with transacoes_path.open("w", newline="", encoding="utf-8") as trans_file, itens_path.open(
-        "w", newline="", encoding="utf-8"
-    ) as itens_file:
-        trans_writer = csv.writer(trans_file)
-        itens_writer = csv.writer(itens_file)
-
-        trans_writer.writerow(
-            [
-                "id_transacao",
-                "data_transacao",
-                "cliente",
-                "produto",
-                "categoria",
-                "valor",
-                "status_pagamento",
-                "data_pagamento",
-            ]
+    datas_candidatas, datas_pesos = _build_date_weights(rng, start_date, end_date)
+    datas_alias = build_alias(datas_pesos)
+
+    # Datas candidatas são dias consecutivos até end_date: a data de pagamento é só um
+    # deslocamento de índice, e cada dia é formatado uma única vez
+    datas_str = [d.strftime("%d/%m/%Y") for d in datas_candidatas]
+
+    # Status depende da categoria do produto principal: um sorteio por grupo de CDF
+    status_grupos = list(status_cdfs)
+    status_grupo_produto = np.array(
+        [status_grupos.index(c if c in status_cdfs else "default") for c in categorias_produto]
+    )
+
+    # Campos de texto escapados uma única vez; as linhas são montadas com f-string
+    context = _ShardContext(
+        produtos_alias=produtos_alias,
+        clientes_alias=clientes_alias,
+        datas_alias=datas_alias,
+        status_options=status_options,
+        status_cdfs=list(status_cdfs.values()),
+        status_grupo_produto=status_grupo_produto,
+        categorias_produto=categorias_produto,
+        produtos_csv=[csv_field(p) for p in produtos],
+        clientes_csv=[csv_field(c) for c in clientes],
+        datas_str=datas_str,
+        is_acessorio=is_acessorio,
+        acessorios_idx=acessorios_idx,
+        preco_min=preco_min,
+        preco_max=preco_max,
+    )
+
+    with open(transacoes_path, "wb") as trans_file:
+        trans_file.write(
+            b"id_transacao,data_transacao,cliente,produto,categoria,valor,"
+            b"status_pagamento,data_pagamento\n"
         )
-        itens_writer.writerow(
-            [
-                "id_transacao",
-                "produto",
-                "quantidade",
-                "valor_unitario",
-                "valor_total",
-            ]
-        )
-
-        trans_chunk = []
-        itens_chunk = []
-        chunk_size = 20000
-
-        for idx in range(1, rows + 1):
-            id_transacao = f"TRX-PORT-{idx:09d}"
-            produto_principal = _pick_from_cdf(produtos, produtos_cdf)
-            produto_info = produto_map[produto_principal]
-            categoria = produto_info["categoria"]
-            cliente = _pick_from_cdf(clientes, clientes_cdf)
-            data_transacao = _pick_from_cdf(datas_candidatas, datas_cdf)
-
-            status_cdf = status_cdfs.get(categoria, status_cdfs["default"])
-            status = _pick_from_cdf(status_options, status_cdf)
-
-            data_pagamento = ""
-            if status == "pago":
-                pagamento = data_transacao + timedelta(days=random.randint(0, 15))
-                if pagamento > end_date:
-                    pagamento = end_date
-                data_pagamento = pagamento.strftime("%d/%m/%Y")
-            elif status == "atrasado":
-                if random.random() < 0.35:
-                    pagamento = data_transacao + timedelta(days=random.randint(20, 60))
-                    if pagamento <= end_date:
-                        data_pagamento = pagamento.strftime("%d/%m/%Y")
-
-            r = random.random()
-            if r < 0.55:
-                itens_count = 1
-            elif r < 0.85:
-                itens_count = 2
-            elif r < 0.97:
-                itens_count = 3
-            else:
-                itens_count = 4
-
-            itens = [produto_principal]
-            while len(itens) < itens_count:
-                if categoria != "Acessorios" and random.random() < 0.6:
-                    itens.append(random.choice(acessorios))
-                else:
-                    itens.append(_pick_from_cdf(produtos, produtos_cdf))
-
-            valor_total_transacao = 0.0
-            for produto in itens:
-                info = produto_map[produto]
-                quantidade = 1 if random.random() < 0.8 else random.randint(2, 3)
-                valor_unitario = random.uniform(info["preco_min"], info["preco_max"])
-                valor_total_item = round(valor_unitario * quantidade, 2)
-                valor_total_transacao += valor_total_item
-
-                itens_chunk.append(
-                    [
-                        id_transacao,
-                        produto,
-                        quantidade,
-                        f"{valor_unitario:.2f}",
-                        f"{valor_total_item:.2f}",
-                    ]
-                )
+    with open(itens_path, "wb") as itens_file:
+        itens_file.write(b"id_transacao,produto,quantidade,valor_unitario,valor_total\n")
+
+    # Uma semente por bloco de CHUNK_ROWS linhas: a saída de uma --seed não depende
+    # de quantos workers dividem o trabalho. Faixas contíguas, alinhadas aos blocos
+    blocos = -(-rows // CHUNK_ROWS)
+    sementes_blocos = seed_seq.spawn(blocos)
+    passo = -(-blocos // max(1, min(workers, blocos))) * CHUNK_ROWS if blocos else rows
+    limites = [*range(0, rows, passo), rows] if rows else [0]
+    faixas = list(zip(limites, limites[1:]))
+    sementes = [
+        sementes_blocos[inicio // CHUNK_ROWS : -(-fim // CHUNK_ROWS)] for inicio, fim in faixas
+    ]
 
-            trans_chunk.append(
-                [
-                    id_transacao,
-                    data_transacao.strftime("%d/%m/%Y"),
-                    cliente,
-                    produto_principal,
-                    categoria,
-                    f"{valor_total_transacao:.2f}",
-                    status,
-                    data_pagamento,
-                ]
+    if len(faixas) <= 1:
+        _init_shard_worker(context)
+        for (inicio, fim), semente in zip(faixas, sementes):
+            _write_shard(inicio, fim, semente, transacoes_path, itens_path)
+    else:
+        # Cada processo grava seu shard (sem cabeçalho); depois os shards são
+        # concatenados em ordem, mantendo os IDs sequenciais nos arquivos finais
+        partes = [
+            (
+                output_dir / f"{transacoes_path.stem}.part{i:03d}",
+                output_dir / f"{itens_path.stem}.part{i:03d}",
             )
+            for i in range(len(faixas))
+        ]
+        for parte in partes:
+            for parte_path in parte:
+                parte_path.write_bytes(b"")
+
+        with ProcessPoolExecutor(
+            max_workers=len(faixas),
+            initializer=_init_shard_worker,
+            initargs=(context,),
+        ) as executor:
+            futures = [
+                executor.submit(_write_shard, inicio, fim, semente, trans_parte, itens_parte)
+                for (inicio, fim), semente, (trans_parte, itens_parte) in zip(
+                    faixas, sementes, partes
+                )
+            ]
+            for future in futures:
+                future.result()
 
-            if idx % chunk_size == 0:
-                trans_writer.writerows(trans_chunk)
-                itens_writer.writerows(itens_chunk)
-                trans_chunk.clear()
-                itens_chunk.clear()
-            if idx % 200000 == 0:
-                print(f"Gerados {idx} registros...")
-
-        if trans_chunk:
-            trans_writer.writerows(trans_chunk)
-        if itens_chunk:
-            itens_writer.writerows(itens_chunk)
+        _concat_parts(transacoes_path, [trans_parte for trans_parte, _ in partes])
+        _concat_parts(itens_path, [itens_parte for _, itens_parte in partes])
 
     print(f"Catálogo: {catalog_path}")
     print(f"Transacoes: {transacoes_path}")
@@ -389,10 +623,19 @@ def main():
     parser.add_argument("--rows", type=int, default=1000000)
     parser.add_argument("--years", type=int, default=5)
     parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--synthetic-names", action="store_true")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
     args = parser.parse_args()
 
     settings = get_settings()
-    generate_dataset(args.rows, args.years, settings.raw_data_path, seed=args.seed)
+    generate_dataset(
+        args.rows,
+        args.years,
+        settings.raw_data_path,
+        seed=args.seed,
+        synthetic_names=args.synthetic_names,
+        workers=args.workers,
+    )
 
 
 if __name__ == "__main__":
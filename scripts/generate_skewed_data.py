@@ -1,15 +1,22 @@
 import argparse
-import csv
 import random
 import sys
+from bisect import bisect
 from datetime import datetime, timedelta
+from itertools import accumulate
 from pathlib import Path
 
-from faker import Faker
-
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from config.settings import get_settings
+from scripts.generate_portfolio_data import (
+    WRITE_BUFFER_SIZE,
+    build_alias,
+    build_client_names,
+    csv_field,
+    pick_alias,
+    write_lines,
+)
 
 
 def _build_product_catalog():
@@ -38,68 +45,79 @@ def _build_product_catalog():
     return items
 
 
-def _build_client_pool(fake: Faker, size: int = 2000):
-    clients = [fake.name() for _ in range(size)]
+def _build_client_pool(rnd: random.Random, size: int = 2000, synthetic: bool = False):
+    clients = build_client_names(size, synthetic)
     weights = []
     for _ in clients:
-        weights.append(max(1, int(random.paretovariate(1.3) * 10)))
+        weights.append(max(1, int(rnd.paretovariate(1.3) * 10)))
     return clients, weights
 
 
-def _pick_date(start_date: datetime, end_date: datetime):
+def _build_date_cdf(start_date: datetime, end_date: datetime):
+    # Distribuição exata do sorteio em três etapas (ano, mês, dia) achatada numa única
+    # tabela: P(data) = P(ano) * P(mês | ano) / dias possíveis no mês
     years = list(range(start_date.year, end_date.year + 1))
-    year_weights = [i + 1 for i in range(len(years))]
-    year = random.choices(years, weights=year_weights, k=1)[0]
-
-    if year == start_date.year and year == end_date.year:
-        min_month = start_date.month
-        max_month = end_date.month
-    elif year == start_date.year:
-        min_month = start_date.month
-        max_month = 12
-    elif year == end_date.year:
-        min_month = 1
-        max_month = end_date.month
-    else:
-        min_month = 1
-        max_month = 12
-
-    months = list(range(min_month, max_month + 1))
-    month_weights = list(reversed(range(1, len(months) + 1)))
-    month = random.choices(months, weights=month_weights, k=1)[0]
-
-    if year == start_date.year and month == start_date.month:
-        min_day = min(start_date.day, 28)
-        max_day = 28
-    elif year == end_date.year and month == end_date.month:
-        min_day = 1
-        max_day = min(end_date.day, 28)
-    else:
-        min_day = 1
-        max_day = 28
-
-    if min_day > max_day:
-        min_day = 1
-
-    day = random.randint(min_day, max_day)
-    return datetime(year, month, day)
-
-
-def _pick_status():
-    statuses = ["pago", "pendente", "atrasado", "cancelado", "erro"]
-    weights = [0.60, 0.18, 0.10, 0.08, 0.04]
-    return random.choices(statuses, weights=weights, k=1)[0]
-
-
-def _pick_value():
-    r = random.random()
+    year_total = len(years) * (len(years) + 1) / 2
+
+    dates = []
+    weights = []
+    for year_idx, year in enumerate(years):
+        min_month = start_date.month if year == start_date.year else 1
+        max_month = end_date.month if year == end_date.year else 12
+        months = list(range(min_month, max_month + 1))
+        month_total = len(months) * (len(months) + 1) / 2
+
+        for month_idx, month in enumerate(months):
+            if year == start_date.year and month == start_date.month:
+                min_day = min(start_date.day, 28)
+                max_day = 28
+            elif year == end_date.year and month == end_date.month:
+                min_day = 1
+                max_day = min(end_date.day, 28)
+            else:
+                min_day = 1
+                max_day = 28
+
+            if min_day > max_day:
+                min_day = 1
+
+            days = range(min_day, max_day + 1)
+            weight = (
+                (year_idx + 1) / year_total * (len(months) - month_idx) / month_total / len(days)
+            )
+            for day in days:
+                dates.append(datetime(year, month, day))
+                weights.append(weight)
+
+    total = sum(weights)
+    cdf = [acc / total for acc in accumulate(weights)]
+    return dates, cdf
+
+
+# Deslocamentos de pagamento pré-alocados (0 a 60 dias)
+_TD_DAYS = tuple(timedelta(days=i) for i in range(61))
+
+STATUSES = ["pago", "pendente", "atrasado", "cancelado", "erro"]
+STATUS_WEIGHTS = [0.60, 0.18, 0.10, 0.08, 0.04]
+
+
+def _pick_date_idx(cdf, rand):
+    return min(bisect(cdf, rand()), len(cdf) - 1)
+
+
+def _pick_status(choices):
+    return choices(STATUSES, weights=STATUS_WEIGHTS, k=1)[0]
+
+
+def _pick_value(rand, uniform):
+    r = rand()
     if r < 0.60:
-        return random.uniform(50, 2000)
+        return uniform(50, 2000)
     if r < 0.85:
-        return random.uniform(2000, 10000)
+        return uniform(2000, 10000)
     if r < 0.95:
-        return random.uniform(10000, 50000)
-    return random.uniform(50000, 300000)
+        return uniform(10000, 50000)
+    return uniform(50000, 300000)
 
 
 def generate(
@@ -107,70 +125,73 @@ def generate(
     output_path: Path,
     seed: int | None = None,
     years: int = 5,
+    synthetic_names: bool = False,
 ):
-    if seed is not None:
-        random.seed(seed)
-
-    fake = Faker("pt_BR")
+    # Gerador próprio (isolado do módulo random global)
+    rnd = random.Random(seed)
 
     catalog = _build_product_catalog()
+    # Produtos sorteados por índice: nome e categoria vêm de listas paralelas
     products = [item["produto"] for item in catalog]
+    product_categories = [item["categoria"] for item in catalog]
     product_weights = [item["peso"] for item in catalog]
-    product_to_category = {item["produto"]: item["categoria"] for item in catalog}
+    product_indices = range(len(products))
 
-    clients, client_weights = _build_client_pool(fake)
+    clients, client_weights = _build_client_pool(rnd, synthetic=synthetic_names)
+    products_alias = build_alias(product_weights)
+    clients_alias = build_alias(client_weights)
 
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
     end_date = datetime.now()
     start_date = end_date - timedelta(days=years * 365)
+    dates, dates_cdf = _build_date_cdf(start_date, end_date)
+    dates_str = [d.strftime("%d/%m/%Y") for d in dates]
 
-    with output_path.open("w", newline="", encoding="utf-8") as csvfile:
-        writer = csv.writer(csvfile)
-        writer.writerow(
-            [
-                "id_transacao",
-                "data_transacao",
-                "cliente",
-                "produto",
-                "categoria",
-                "valor",
-                "status_pagamento",
-                "data_pagamento",
-            ]
+    products_csv = [csv_field(p) for p in products]
+    clients_csv = [csv_field(c) for c in clients]
+
+    with open(output_path, "wb", buffering=WRITE_BUFFER_SIZE) as csvfile:
+        csvfile.write(
+            b"id_transacao,data_transacao,cliente,produto,categoria,valor,"
+            b"status_pagamento,data_pagamento\n"
         )
 
+        chunk = []
+        chunk_size = 20000
+
+        # Métodos do gerador em variáveis locais: sem busca de atributo a cada chamada
+        _rand = rnd.random
+        _randint = rnd.randint
+        _uniform = rnd.uniform
+        _choices = rnd.choices
+
         for idx in range(1, rows + 1):
-            data_transacao = _pick_date(start_date, end_date)
-            status = _pick_status()
-            produto = random.choices(products, weights=product_weights, k=1)[0]
-            categoria = product_to_category[produto]
-            cliente = random.choices(clients, weights=client_weights, k=1)[0]
-            valor = _pick_value()
+            date_idx = _pick_date_idx(dates_cdf, _rand)
+            data_transacao = dates[date_idx]
+            status = _pick_status(_choices)
+            produto_idx = pick_alias(product_indices, *products_alias, _rand)
+            cliente = pick_alias(clients_csv, *clients_alias, _rand)
+            valor = _pick_value(_rand, _uniform)
 
             data_pagamento = ""
             if status == "pago":
-                data_pagamento = (data_transacao + timedelta(days=random.randint(0, 15))).strftime(
-                    "%d/%m/%Y"
-                )
+                data_pagamento = (data_transacao + _TD_DAYS[_randint(0, 15)]).strftime("%d/%m/%Y")
             elif status == "atrasado":
-                if random.random() < 0.35:
-                    data_pagamento = (
-                        data_transacao + timedelta(days=random.randint(20, 60))
-                    ).strftime("%d/%m/%Y")
-
-            writer.writerow(
-                [
-                    f"TRX-SK-{idx:07d}",
-                    data_transacao.strftime("%d/%m/%Y"),
-                    cliente,
-                    produto,
-                    categoria,
-                    f"{valor:.2f}",
-                    status,
-                    data_pagamento,
-                ]
+                if _rand() < 0.35:
+                    data_pagamento = (data_transacao + _TD_DAYS[_randint(20, 60)]).strftime(
+                        "%d/%m/%Y"
+                    )
+
+            chunk.append(
+                f"TRX-SK-{idx:07d},{dates_str[date_idx]},{cliente},"
+                f"{products_csv[produto_idx]},{product_categories[produto_idx]},{valor:.2f},"
+                f"{status},{data_pagamento}\n"
             )
+            if idx % chunk_size == 0:
+                write_lines(csvfile, chunk)
+
+        write_lines(csvfile, chunk)
 
 
 def main():
@@ -179,6 +200,7 @@ def main():
     parser.add_argument("--years", type=int, default=5)
     parser.add_argument("--seed", type=int, default=None)
     parser.add_argument("--output", type=str, default="")
+    parser.add_argument("--synthetic-names", action="store_true")
     args = parser.parse_args()
 
     settings = get_settings()
@@ -189,7 +211,13 @@ def main():
         / f"performance_test_skew_{args.rows}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
     )
 
-    generate(args.rows, output, seed=args.seed, years=args.years)
+    generate(
+        args.rows,
+        output,
+        seed=args.seed,
+        years=args.years,
+        synthetic_names=args.synthetic_names,
+    )
     print(f"Generated: {output}")
 
 
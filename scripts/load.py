@@ -8,35 +8,80 @@ Implementa inserção em lote, controle de duplicatas e logging.
 Autor: Kaio Ambrosio
 """
 
+import asyncio
 import csv
+import io
 import sys
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import datetime
 from decimal import Decimal
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, Iterator, Optional, TextIO
 
 import pandas as pd
 from loguru import logger
+from psycopg2.extras import execute_values
 from sqlalchemy import text
 from sqlalchemy.dialects.postgresql import insert
-from sqlalchemy.exc import IntegrityError, OperationalError
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import Session, sessionmaker
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from config.settings import get_settings
 from scripts.models import (
+    MATERIALIZED_VIEWS,
     ArquivoProcessado,
     Base,
     Categoria,
     LogETL,
     Produto,
-    Transacao,
-    TransacaoItem,
+    create_materialized_views,
     get_engine,
 )
 
+# Linhas serializadas por vez ao alimentar o COPY de transações
+COPY_CHUNK_ROWS = 50_000
+
+# Hashes de arquivos já processados lembrados em memória durante a execução
+PROCESSED_HASHES_CACHE_SIZE = 10_000
+
+# Conexões (e blocos de linhas) usadas em paralelo pelo COPY assíncrono
+COPY_ASYNC_CONNECTIONS = 4
+
+# Colunas da tabela transacoes, na ordem usada pelo INSERT e pelo COPY
+TRANSACAO_COLUMNS = (
+    "id_transacao",
+    "data_transacao",
+    "cliente",
+    "produto",
+    "categoria",
+    "valor",
+    "status_pagamento",
+    "data_pagamento",
+    "ano_transacao",
+    "mes_transacao",
+    "dia_semana",
+    "trimestre",
+    "arquivo_origem",
+)
+
+# INSERT montado uma vez para o execute_values (VALUES %s expandido por lote)
+TRANSACAO_INSERT_SQL = (
+    f"INSERT INTO transacoes ({', '.join(TRANSACAO_COLUMNS)}) VALUES %s "
+    "ON CONFLICT (id_transacao) DO NOTHING"
+)
+# Colunas lidas do arquivo de itens e tamanho (bytes) dos blocos do leitor pyarrow
+ITEM_COLUMNS = ("id_transacao", "produto", "quantidade", "valor_unitario", "valor_total")
+ITEM_CSV_BLOCK_SIZE = 16 * 1024 * 1024
+TRANSACAO_ITEM_INSERT_SQL = (
+    "INSERT INTO transacao_itens "
+    "(id_transacao, produto_id, quantidade, valor_unitario, valor_total) VALUES %s"
+)
+
 
 @dataclass
 class LoadResult:
@@ -77,6 +122,12 @@ class DataLoader:
         self.engine = None
         self.Session = None
         self._connected = False
+        # create_all verificado uma vez por carregador, não a cada arquivo
+        self._tables_ready = False
+        # LRU de hashes já confirmados como processados: evita consultar o banco de novo
+        self._processed_hashes: OrderedDict[str, None] = OrderedDict()
+        # Mapa nome -> id de produtos, carregado uma vez e invalidado por load_catalog
+        self._produto_map: Optional[Dict[str, int]] = None
 
         logger.info("DataLoader inicializado")
 
@@ -113,12 +164,16 @@ class DataLoader:
         Returns:
             True se as tabelas existem/foram criadas.
         """
+        if self._tables_ready:
+            return True
+
         if not self._connected:
             if not self.connect():
                 return False
 
         try:
             Base.metadata.create_all(self.engine)
+            self._tables_ready = True
             logger.info("Tabelas verificadas/criadas com sucesso")
             return True
 
@@ -126,30 +181,93 @@ class DataLoader:
             logger.error(f"Erro ao criar tabelas: {str(e)}")
             return False
 
-    def check_file_processed(self, file_hash: str) -> bool:
+    def ensure_materialized_views(self) -> bool:
+        """
+        Cria as materialized views consultadas pela API caso ainda não existam.
+
+        Cobre bancos criados apenas via SQLAlchemy ou anteriores às views, mesmo
+        quando a execução não carrega nenhum registro novo.
+
+        Returns:
+            True se as views existem/foram criadas.
+        """
+        if not self.ensure_tables_exist():
+            return False
+
+        try:
+            if create_materialized_views(self.engine):
+                logger.info(f"Materialized views criadas: {', '.join(MATERIALIZED_VIEWS)}")
+            return True
+
+        except Exception as e:
+            logger.error(f"Erro ao criar materialized views: {str(e)}")
+            return False
+
+    def refresh_materialized_views(self) -> bool:
+        """
+        Atualiza as materialized views consultadas pela API.
+
+        Cria as views antes, caso ainda não existam.
+
+        Returns:
+            True se as views foram atualizadas com sucesso.
+        """
+        if not self.ensure_materialized_views():
+            return False
+
+        try:
+            with self.engine.begin() as conn:
+                for view in MATERIALIZED_VIEWS:
+                    conn.execute(text(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {view}"))
+
+            logger.info(f"Materialized views atualizadas: {', '.join(MATERIALIZED_VIEWS)}")
+            return True
+
+        except Exception as e:
+            logger.error(f"Erro ao atualizar materialized views: {str(e)}")
+            return False
+
+    def check_file_processed(self, file_hash: str, session: Optional[Session] = None) -> bool:
         """
         Verifica se um arquivo já foi processado.
 
         Args:
             file_hash: Hash MD5 do arquivo.
+            session: Sessão da carga em andamento. Se omitida, abre uma própria.
 
         Returns:
             True se o arquivo já foi processado.
         """
+        if file_hash in self._processed_hashes:
+            self._processed_hashes.move_to_end(file_hash)
+            return True
+
         if not self._connected:
             return False
 
-        with self.Session() as session:
-            result = (
-                session.query(ArquivoProcessado)
-                .filter(
-                    ArquivoProcessado.hash_arquivo == file_hash,
-                    ArquivoProcessado.status == "PROCESSADO",
-                )
-                .first()
-            )
+        if session is None:
+            with self.Session() as own_session:
+                return self.check_file_processed(file_hash, own_session)
+
+        result = session.execute(
+            text(
+                "SELECT 1 FROM arquivos_processados "
+                "WHERE hash_arquivo = :hash AND status = 'PROCESSADO' LIMIT 1"
+            ),
+            {"hash": file_hash},
+        ).scalar()
+        if result is None:
+            return False
 
-            return result is not None
+        self._remember_processed(file_hash)
+        return True
+
+    def _remember_processed(self, file_hash: str) -> None:
+        """Guarda o hash no LRU de arquivos processados, descartando o mais antigo."""
+        self._processed_hashes[file_hash] = None
+        self._processed_hashes.move_to_end(file_hash)
+        if len(self._processed_hashes) > PROCESSED_HASHES_CACHE_SIZE:
+            self._processed_hashes.popitem(last=False)
 
     def register_file_processed(
         self,
@@ -171,14 +289,14 @@ class DataLoader:
             file_size: Tamanho em bytes.
             log_id: ID do log relacionado.
         """
-        arquivo = ArquivoProcessado(
+        stmt = insert(ArquivoProcessado).values(
             nome_arquivo=file_name,
             caminho_completo=file_path,
             hash_arquivo=file_hash,
             tamanho_bytes=file_size,
             id_log_etl=log_id,
         )
-        session.add(arquivo)
+        session.execute(stmt.on_conflict_do_nothing(index_elements=["nome_arquivo"]))
 
     def create_log_entry(
         self, session: Session, file_name: str, file_hash: str, status: str = "EM_ANDAMENTO"
@@ -245,12 +363,16 @@ class DataLoader:
         self, session: Session, df: pd.DataFrame, batch_size: int = 1000
     ) -> Dict[str, int]:
         """
-        Insere dados em lote usando upsert (insert on conflict).
+        Insere dados via COPY numa tabela de staging e INSERT ... SELECT com ON CONFLICT.
+
+        O COPY alimenta uma tabela temporária (descartada no commit) na conexão
+        da sessão, na mesma transação; o INSERT ... SELECT final ignora as
+        duplicatas de id_transacao, como a inserção em lote fazia.
 
         Args:
             session: Sessão do SQLAlchemy.
             df: DataFrame com os dados a inserir.
-            batch_size: Tamanho do lote.
+            batch_size: Linhas serializadas por vez para o COPY.
 
         Returns:
             Dicionário com estatísticas da inserção.
@@ -260,48 +382,54 @@ class DataLoader:
             "skipped": 0,
             "failed": 0,
         }
+        if df.empty:
+            return stats
+
+        columns = ", ".join(TRANSACAO_COLUMNS)
+        # Mesmos valores padrão e tipos do payload do execute_values
+        payload = pd.DataFrame(_transacao_columns(df), columns=list(TRANSACAO_COLUMNS))
+        buffer = _DataFrameCsvStream(
+            payload,
+            chunk_rows=batch_size,
+            sep=",",
+            quoting=csv.QUOTE_MINIMAL,
+            date_format="%Y-%m-%d %H:%M:%S",
+            na_rep="",
+        )
 
-        # Converter DataFrame para lista de dicionários
-        records = df.to_dict("records")
-
-        for i in range(0, len(records), batch_size):
-            batch = records[i : i + batch_size]
-
-            try:
-                for record in batch:
-                    # Preparar dados para inserção
-                    transacao = Transacao(
-                        id_transacao=str(record.get("id_transacao")),
-                        data_transacao=record.get("data_transacao"),
-                        cliente=str(record.get("cliente")),
-                        produto=str(record.get("produto")),
-                        categoria=str(record.get("categoria")),
-                        valor=Decimal(str(record.get("valor", 0))),
-                        status_pagamento=str(record.get("status_pagamento")),
-                        data_pagamento=record.get("data_pagamento"),
-                        ano_transacao=int(record.get("ano_transacao", 0)),
-                        mes_transacao=int(record.get("mes_transacao", 0)),
-                        dia_semana=record.get("dia_semana"),
-                        trimestre=record.get("trimestre"),
-                        arquivo_origem=str(record.get("arquivo_origem", "")),
+        try:
+            # Savepoint: um erro desfaz só a staging, não o log da carga
+            with session.begin_nested():
+                # Sem as colunas de default (id serial, data_processamento) na staging
+                session.execute(
+                    text(
+                        f"CREATE TEMP TABLE transacoes_stage ON COMMIT DROP AS "
+                        f"SELECT {columns} FROM transacoes WITH NO DATA"
                     )
+                )
+                self._copy_from_buffer(
+                    session, "transacoes_stage", list(TRANSACAO_COLUMNS), buffer
+                )
 
-                    # Tentar inserir
-                    try:
-                        session.add(transacao)
-                        session.flush()
-                        stats["inserted"] += 1
-                    except IntegrityError:
-                        session.rollback()
-                        stats["skipped"] += 1
-                        logger.debug(f"Duplicata ignorada: {record.get('id_transacao')}")
+                result = session.execute(
+                    text(
+                        f"INSERT INTO transacoes ({columns}) "
+                        f"SELECT {columns} FROM transacoes_stage "
+                        "ON CONFLICT (id_transacao) DO NOTHING"
+                    )
+                )
+                session.execute(text("DROP TABLE transacoes_stage"))
 
-            except Exception as e:
-                logger.error(f"Erro no lote {i//batch_size + 1}: {str(e)}")
-                stats["failed"] += len(batch) - stats["inserted"] - stats["skipped"]
-                session.rollback()
+            inserted = result.rowcount
+            stats["inserted"] = inserted
+            stats["skipped"] = len(df) - inserted
+            logger.debug(f"Staging: {inserted} inseridos, {len(df) - inserted} ignorados")
 
-            logger.debug(f"Lote {i//batch_size + 1}: {len(batch)} registros processados")
+        except Exception as e:
+            logger.error(f"Erro na carga via staging: {str(e)}")
+            stats["failed"] = len(df)
+        finally:
+            buffer.close()
 
         return stats
 
@@ -311,7 +439,8 @@ class DataLoader:
         """
         Insere dados em lote usando bulk insert com ON CONFLICT DO NOTHING.
 
-        Mais eficiente que insert_batch para grandes volumes.
+        As linhas vão como tuplas na ordem de TRANSACAO_COLUMNS direto para
+        ``execute_values``, sem dicionários por linha nem bind params do SQLAlchemy.
 
         Args:
             session: Sessão do SQLAlchemy.
@@ -327,84 +456,149 @@ class DataLoader:
             "failed": 0,
         }
 
-        # Converter DataFrame para lista de dicionários
-        records = df.to_dict("records")
-
-        for i in range(0, len(records), batch_size):
-            batch = records[i : i + batch_size]
-
-            # Preparar dados para inserção
-            values = []
-            for record in batch:
-                values.append(
-                    {
-                        "id_transacao": str(record.get("id_transacao")),
-                        "data_transacao": record.get("data_transacao"),
-                        "cliente": str(record.get("cliente")),
-                        "produto": str(record.get("produto")),
-                        "categoria": str(record.get("categoria")),
-                        "valor": Decimal(str(record.get("valor", 0))),
-                        "status_pagamento": str(record.get("status_pagamento")),
-                        "data_pagamento": (
-                            record.get("data_pagamento")
-                            if pd.notna(record.get("data_pagamento"))
-                            else None
-                        ),
-                        "ano_transacao": int(record.get("ano_transacao", 0)),
-                        "mes_transacao": int(record.get("mes_transacao", 0)),
-                        "dia_semana": (
-                            record.get("dia_semana") if pd.notna(record.get("dia_semana")) else None
-                        ),
-                        "trimestre": (
-                            record.get("trimestre") if pd.notna(record.get("trimestre")) else None
-                        ),
-                        "arquivo_origem": str(record.get("arquivo_origem", "")),
-                    }
-                )
+        # Colunas convertidas por bloco de lotes (cerca de COPY_CHUNK_ROWS linhas): só um
+        # bloco de objetos Python fica em memória e os lotes fatiam as listas prontas
+        block_rows = batch_size * max(1, COPY_CHUNK_ROWS // batch_size)
 
-            try:
-                # Usar insert com on_conflict_do_nothing
-                stmt = insert(Transacao).values(values)
-                stmt = stmt.on_conflict_do_nothing(index_elements=["id_transacao"])
-
-                result = session.execute(stmt)
-                inserted = result.rowcount
-                stats["inserted"] += inserted
-                stats["skipped"] += len(batch) - inserted
-
-                logger.debug(
-                    f"Lote {i//batch_size + 1}: {inserted} inseridos, "
-                    f"{len(batch) - inserted} ignorados"
-                )
+        for block_start in range(0, len(df), block_rows):
+            block = df.iloc[block_start : block_start + block_rows]
+            arrays = tuple(_transacao_columns(block).values())
 
-            except Exception as e:
-                logger.error(f"Erro no lote {i//batch_size + 1}: {str(e)}")
-                stats["failed"] += len(batch)
-                session.rollback()
+            for offset in range(0, len(block), batch_size):
+                i = block_start + offset
+                rows = list(zip(*(column[offset : offset + batch_size] for column in arrays)))
+
+                try:
+                    # Savepoint por lote: um erro desfaz só o lote, não o log nem os anteriores
+                    with session.begin_nested():
+                        with session.connection().connection.cursor() as cursor:
+                            execute_values(
+                                cursor, TRANSACAO_INSERT_SQL, rows, page_size=len(rows)
+                            )
+                            inserted = cursor.rowcount
+                    stats["inserted"] += inserted
+                    stats["skipped"] += len(rows) - inserted
+
+                    logger.debug(
+                        f"Lote {i//batch_size + 1}: {inserted} inseridos, "
+                        f"{len(rows) - inserted} ignorados"
+                    )
+
+                except Exception as e:
+                    logger.error(f"Erro no lote {i//batch_size + 1}: {str(e)}")
+                    stats["failed"] += len(rows)
 
         return stats
 
 
-    def _copy_from_csv(self, table: str, columns: list[str], file_path: Path) -> None:
+    def _copy_from_buffer(
+        self, session: Session, table: str, columns: list[str], buffer: TextIO
+    ) -> None:
         """
-        Executa COPY FROM STDIN para carregar CSV em tabela.
+        Executa COPY FROM STDIN para carregar CSV lido de um objeto de texto.
+
+        O COPY roda na conexão da sessão: o commit fica a cargo de quem chama.
 
         Args:
+            session: Sessão do SQLAlchemy.
             table: Nome da tabela de destino.
-            columns: Lista de colunas na ordem do arquivo.
-            file_path: Caminho do CSV.
+            columns: Lista de colunas na ordem do CSV.
+            buffer: Objeto de texto com o CSV (sem cabeçalho), lido até o fim.
         """
         copy_sql = (
             f"COPY {table} ({', '.join(columns)}) FROM STDIN "
             "WITH (FORMAT csv, DELIMITER ',', NULL '')"
         )
 
+        with session.connection().connection.cursor() as cursor:
+            cursor.copy_expert(copy_sql, buffer)
+
+    async def _copy_async(
+        self, df: pd.DataFrame, stage: str, columns: list[str], processed_at: datetime
+    ) -> None:
+        """
+        Copia as transações via asyncpg, em blocos paralelos, para uma tabela de staging.
+
+        Cria ``stage`` como tabela UNLOGGED com as colunas de ``columns`` e divide o
+        DataFrame em COPY_ASYNC_CONNECTIONS faixas de linhas; cada faixa vai por
+        ``copy_records_to_table`` numa conexão própria do pool, com as tuplas
+        montadas a partir das colunas enquanto o servidor consome as anteriores.
+        Nada é gravado em transacoes: quem chama move os dados da staging na
+        própria transação e remove a tabela ao final.
+
+        Args:
+            df: DataFrame transformado.
+            stage: Nome da tabela de staging a criar.
+            columns: Colunas copiadas (as de TRANSACAO_COLUMNS + data_processamento).
+            processed_at: Data/hora gravada em data_processamento.
+        """
+        import asyncpg
+
+        arrays = list(_transacao_columns(df).values())
+        total = len(df)
+        step = max(1, -(-total // COPY_ASYNC_CONNECTIONS))
+
+        def records(inicio: int):
+            fatias = [array[inicio : inicio + step] for array in arrays]
+            for row in zip(*fatias):
+                yield row + (processed_at,)
+
+        async def copy_chunk(pool, inicio: int) -> None:
+            async with pool.acquire() as conn:
+                await conn.copy_records_to_table(stage, records=records(inicio), columns=columns)
+
+        # valor como double precision na staging: vai como float no COPY binário e
+        # o INSERT ... SELECT converte para NUMERIC(15, 2) no servidor
+        select_list = ", ".join(
+            "valor::double precision AS valor" if col == "valor" else col for col in columns
+        )
+        # Credenciais por parâmetro: a URL usa quote_plus e o asyncpg decodifica
+        # com unquote, o que corromperia senhas com espaço
+        async with asyncpg.create_pool(
+            host=self.settings.db_host,
+            port=self.settings.db_port,
+            user=self.settings.db_user,
+            password=self.settings.db_password,
+            database=self.settings.db_name,
+            min_size=1,
+            max_size=COPY_ASYNC_CONNECTIONS,
+        ) as pool:
+            await pool.execute(
+                f"CREATE UNLOGGED TABLE {stage} AS "
+                f"SELECT {select_list} FROM transacoes WITH NO DATA"
+            )
+            # Todos os blocos terminam antes de propagar um erro (sem cancelar COPY no meio)
+            results = await asyncio.gather(
+                *(copy_chunk(pool, i) for i in range(0, total, step)), return_exceptions=True
+            )
+            for result in results:
+                if isinstance(result, BaseException):
+                    raise result
+
+    def _drop_stage_table(self, stage: str) -> None:
+        """Remove a tabela de staging do COPY assíncrono (em transação própria)."""
+        try:
+            with self.engine.begin() as conn:
+                conn.execute(text(f"DROP TABLE IF EXISTS {stage}"))
+        except Exception as e:
+            logger.warning(f"Nao foi possivel remover a staging {stage}: {str(e)}")
+
+    @contextmanager
+    def _raw_cursor(self) -> Iterator:
+        """
+        Cursor psycopg2 numa conexão do pool, em uma transação própria.
+
+        Faz commit se o bloco terminar sem erro e rollback caso contrário; a
+        conexão sempre volta ao pool do SQLAlchemy ao final.
+        """
         raw_conn = self.engine.raw_connection()
         try:
             with raw_conn.cursor() as cursor:
-                with file_path.open("r", encoding="utf-8") as handle:
-                    cursor.copy_expert(copy_sql, handle)
+                yield cursor
             raw_conn.commit()
+        except Exception:
+            raw_conn.rollback()
+            raise
         finally:
             raw_conn.close()
 
@@ -420,6 +614,7 @@ class DataLoader:
         Carrega dados usando COPY nativo do PostgreSQL.
         """
         start_time = datetime.now()
+        processed_at = start_time.strftime("%Y-%m-%d %H:%M:%S")
 
         if not self._connected:
             if not self.connect():
@@ -434,29 +629,7 @@ class DataLoader:
                 error_message="Nao foi possivel criar/verificar as tabelas",
             )
 
-        if self.check_file_processed(file_hash):
-            logger.warning(f"Arquivo ja processado anteriormente: {file_name}")
-            return LoadResult(
-                success=True,
-                records_skipped=len(df),
-                error_message="Arquivo ja processado anteriormente",
-            )
-
-        base_columns = [
-            "id_transacao",
-            "data_transacao",
-            "cliente",
-            "produto",
-            "categoria",
-            "valor",
-            "status_pagamento",
-            "data_pagamento",
-            "ano_transacao",
-            "mes_transacao",
-            "dia_semana",
-            "trimestre",
-            "arquivo_origem",
-        ]
+        base_columns = list(TRANSACAO_COLUMNS)
         copy_columns = base_columns + ["data_processamento"]
         missing = [col for col in base_columns if col not in df.columns]
         if missing:
@@ -465,56 +638,82 @@ class DataLoader:
                 error_message=f"Colunas ausentes para COPY: {missing}",
             )
 
-        df_copy = df[base_columns].copy()
-        df_copy["data_processamento"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        df_copy["data_processamento"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
-        for col in ["data_transacao", "data_pagamento"]:
-            if col in df_copy.columns:
-                df_copy[col] = pd.to_datetime(df_copy[col], errors="coerce")
-                df_copy[col] = df_copy[col].dt.strftime("%Y-%m-%d %H:%M:%S")
-
-        df_copy = df_copy.where(pd.notna(df_copy), "")
+        # Verificação, log, COPY e registro do arquivo numa única transação
+        with self.Session() as session:
+            if self.check_file_processed(file_hash, session):
+                logger.warning(f"Arquivo ja processado anteriormente: {file_name}")
+                return LoadResult(
+                    success=True,
+                    records_skipped=len(df),
+                    error_message="Arquivo ja processado anteriormente",
+                )
 
-        temp_dir = self.settings.processed_data_path
-        temp_dir.mkdir(parents=True, exist_ok=True)
-        temp_path = temp_dir / f"transacoes_copy_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+            df_copy = df[base_columns].copy()
+            df_copy["data_processamento"] = processed_at
+
+            # Datas já vêm como datetime64 da transformação; só converte o que não vier
+            for col in ["data_transacao", "data_pagamento"]:
+                if not pd.api.types.is_datetime64_any_dtype(df_copy[col]):
+                    df_copy[col] = pd.to_datetime(df_copy[col], errors="coerce")
+
+            use_async = self.settings.etl_use_copy_async
+            buffer = None
+            stage = None
+            if not use_async:
+                # CSV gerado sob demanda, em blocos, enquanto o COPY consome (sem arquivo
+                # temporário); o to_csv formata as datas e escreve nulos como vazio
+                buffer = _DataFrameCsvStream(
+                    df_copy,
+                    chunk_rows=COPY_CHUNK_ROWS,
+                    sep=",",
+                    quoting=csv.QUOTE_MINIMAL,
+                    date_format="%Y-%m-%d %H:%M:%S",
+                    na_rep="",
+                )
 
-        df_copy.to_csv(
-            temp_path,
-            index=False,
-            header=False,
-            sep=",",
-            encoding="utf-8",
-            quoting=csv.QUOTE_MINIMAL,
-        )
+            try:
+                # Commit assíncrono: se o commit se perder numa queda do servidor, o
+                # registro do arquivo se perde junto e a carga é refeita pelo hash
+                session.execute(text("SET LOCAL synchronous_commit = off"))
 
-        with self.Session() as session:
-            log = self.create_log_entry(session, file_name, file_hash)
-            session.commit()
-            log_id = log.id_log
+                log = self.create_log_entry(session, file_name, file_hash)
+                log_id = log.id_log
+
+                if use_async:
+                    # COPY paralelo numa staging (fora da transação); a passagem para
+                    # transacoes roda nesta transação, junto do log e do registro
+                    stage = f"stg_transacoes_{uuid.uuid4().hex}"
+                    asyncio.run(
+                        self._copy_async(
+                            df_copy, stage, copy_columns, start_time.replace(microsecond=0)
+                        )
+                    )
+                    columns = ", ".join(copy_columns)
+                    inserted = session.execute(
+                        text(
+                            f"INSERT INTO transacoes ({columns}) SELECT {columns} FROM {stage} "
+                            "ON CONFLICT (id_transacao) DO NOTHING"
+                        )
+                    ).rowcount
+                else:
+                    self._copy_from_buffer(session, "transacoes", copy_columns, buffer)
+                    inserted = len(df_copy)
+                skipped = len(df_copy) - inserted
+                execution_time = (datetime.now() - start_time).total_seconds()
 
-        try:
-            self._copy_from_csv("transacoes", copy_columns, temp_path)
-            inserted = len(df_copy)
-            execution_time = (datetime.now() - start_time).total_seconds()
-
-            with self.Session() as session:
-                log_db = session.get(LogETL, log_id)
-                if not log_db:
-                    raise RuntimeError("Log ETL nao encontrado para atualizacao")
                 self.update_log_entry(
                     session=session,
-                    log=log_db,
+                    log=log,
                     status="SUCESSO",
                     records_read=len(df_copy),
                     records_inserted=inserted,
                     records_rejected=0,
-                    duplicates_ignored=0,
+                    duplicates_ignored=skipped,
                     execution_time=execution_time,
                     details={
                         "batch_size": self.settings.etl_batch_size,
                         "use_copy": True,
+                        "use_copy_async": use_async,
                     },
                 )
                 self.register_file_processed(
@@ -526,30 +725,31 @@ class DataLoader:
                     log_id=log_id,
                 )
                 session.commit()
+                self._remember_processed(file_hash)
 
-            logger.success(
-                f"Carga (COPY) concluida: {inserted} inseridos ({execution_time:.2f}s)"
-            )
+                logger.success(
+                    f"Carga (COPY) concluida: {inserted} inseridos, {skipped} ignorados "
+                    f"({execution_time:.2f}s)"
+                )
 
-            return LoadResult(
-                success=True,
-                records_inserted=inserted,
-                records_skipped=0,
-                records_failed=0,
-                log_id=log.id_log,
-                execution_time=execution_time,
-            )
-        except Exception as e:
-            execution_time = (datetime.now() - start_time).total_seconds()
-            logger.error(f"Erro na carga COPY: {str(e)}")
+                return LoadResult(
+                    success=True,
+                    records_inserted=inserted,
+                    records_skipped=skipped,
+                    records_failed=0,
+                    log_id=log_id,
+                    execution_time=execution_time,
+                )
+            except Exception as e:
+                session.rollback()
+                execution_time = (datetime.now() - start_time).total_seconds()
+                logger.error(f"Erro na carga COPY: {str(e)}")
 
-            with self.Session() as session:
-                log_db = session.get(LogETL, log_id)
-                if not log_db:
-                    raise RuntimeError("Log ETL nao encontrado para atualizacao")
+                # O rollback desfaz também o log da carga: o erro fica num log próprio
+                log = self.create_log_entry(session, file_name, file_hash, status="ERRO")
                 self.update_log_entry(
                     session=session,
-                    log=log_db,
+                    log=log,
                     status="ERRO",
                     records_read=len(df_copy),
                     records_inserted=0,
@@ -560,17 +760,16 @@ class DataLoader:
                 )
                 session.commit()
 
-            return LoadResult(
-                success=False,
-                error_message=str(e),
-                execution_time=execution_time,
-            )
-        finally:
-            try:
-                if temp_path.exists():
-                    temp_path.unlink()
-            except Exception:
-                pass
+                return LoadResult(
+                    success=False,
+                    error_message=str(e),
+                    execution_time=execution_time,
+                )
+            finally:
+                if buffer is not None:
+                    buffer.close()
+                if stage is not None:
+                    self._drop_stage_table(stage)
 
     def load(
         self,
@@ -622,17 +821,17 @@ class DataLoader:
                 success=False, error_message="Não foi possível criar/verificar as tabelas"
             )
 
-        # Verificar se arquivo já foi processado
-        if self.check_file_processed(file_hash):
-            logger.warning(f"Arquivo já processado anteriormente: {file_name}")
-            return LoadResult(
-                success=True,
-                records_skipped=len(df),
-                error_message="Arquivo já processado anteriormente",
-            )
-
-        # Iniciar sessão e transação
+        # Iniciar sessão e transação (verificação, carga e registro juntos)
         with self.Session() as session:
+            # Verificar se arquivo já foi processado
+            if self.check_file_processed(file_hash, session):
+                logger.warning(f"Arquivo já processado anteriormente: {file_name}")
+                return LoadResult(
+                    success=True,
+                    records_skipped=len(df),
+                    error_message="Arquivo já processado anteriormente",
+                )
+
             try:
                 # Criar log de execução
                 log = self.create_log_entry(session, file_name, file_hash)
@@ -681,6 +880,7 @@ class DataLoader:
 
                 # Commit da transação
                 session.commit()
+                self._remember_processed(file_hash)
 
                 logger.success(
                     f"Carga concluída: {stats['inserted']} inseridos, "
@@ -749,21 +949,13 @@ class DataLoader:
             .to_dict("records")
         )
 
-        produtos_rows = (
-            df[
-                [
-                    "categoria",
-                    "produto",
-                    "descricao",
-                    "preco_base",
-                    "preco_min",
-                    "preco_max",
-                    "ativo",
-                ]
-            ]
-            .rename(columns={"produto": "nome"})
-            .to_dict("records")
-        )
+        produtos = df[
+            ["categoria", "produto", "descricao", "preco_base", "preco_min", "preco_max", "ativo"]
+        ].rename(columns={"produto": "nome"})
+        # Conversões feitas por coluna, uma vez, e não célula a célula no payload
+        for col in ["preco_base", "preco_min", "preco_max"]:
+            produtos[col] = produtos[col].astype(str).map(Decimal)
+        produtos["ativo"] = produtos["ativo"].astype(bool)
 
         with self.Session() as session:
             try:
@@ -775,22 +967,22 @@ class DataLoader:
                 categorias_db = session.query(Categoria.id, Categoria.nome).all()
                 categoria_map = {c.nome: c.id for c in categorias_db}
 
-                produtos_payload = []
-                for row in produtos_rows:
-                    categoria_id = categoria_map.get(row["categoria"])
-                    if not categoria_id:
-                        continue
-                    produtos_payload.append(
-                        {
-                            "categoria_id": categoria_id,
-                            "nome": row["nome"],
-                            "descricao": row.get("descricao"),
-                            "preco_base": Decimal(str(row.get("preco_base", 0))),
-                            "preco_min": Decimal(str(row.get("preco_min", 0))),
-                            "preco_max": Decimal(str(row.get("preco_max", 0))),
-                            "ativo": bool(row.get("ativo", True)),
-                        }
-                    )
+                # Produtos de categorias desconhecidas ficam de fora
+                produtos["categoria_id"] = produtos["categoria"].map(categoria_map)
+                validos = produtos[produtos["categoria_id"].notna()].astype(
+                    {"categoria_id": "int64"}
+                )
+                produtos_payload = validos[
+                    [
+                        "categoria_id",
+                        "nome",
+                        "descricao",
+                        "preco_base",
+                        "preco_min",
+                        "preco_max",
+                        "ativo",
+                    ]
+                ].to_dict("records")
 
                 if produtos_payload:
                     stmt = insert(Produto).values(produtos_payload)
@@ -798,6 +990,8 @@ class DataLoader:
                     session.execute(stmt)
 
                 session.commit()
+                # Novos produtos: o mapa da carga de itens é recarregado na próxima vez
+                self._produto_map = None
                 return {
                     "categorias": len(categorias_rows),
                     "produtos": len(produtos_payload),
@@ -824,10 +1018,9 @@ class DataLoader:
         total = 0
         inserted = 0
 
-        raw_conn = self.engine.raw_connection()
         try:
-            with raw_conn.cursor() as cursor:
-                cursor.execute("DROP TABLE IF EXISTS stg_transacao_itens")
+            with self._raw_cursor() as cursor:
+                # Tabela de staging descartada no fim da transação (commit ou rollback)
                 cursor.execute(
                     """
                     CREATE TEMP TABLE stg_transacao_itens (
@@ -836,7 +1029,7 @@ class DataLoader:
                         quantidade INTEGER,
                         valor_unitario NUMERIC(15, 2),
                         valor_total NUMERIC(15, 2)
-                    )
+                    ) ON COMMIT DROP
                     """
                 )
 
@@ -851,6 +1044,11 @@ class DataLoader:
                 cursor.execute("SELECT COUNT(*) FROM stg_transacao_itens")
                 total = cursor.fetchone()[0]
 
+                # Estatísticas da staging para o planner escolher o hash join com produtos;
+                # commit assíncrono: a carga pode ser refeita a partir do arquivo
+                cursor.execute("ANALYZE stg_transacao_itens")
+                cursor.execute("SET LOCAL synchronous_commit = off")
+
                 cursor.execute(
                     """
                     INSERT INTO transacao_itens (
@@ -868,16 +1066,12 @@ class DataLoader:
                 )
                 inserted = cursor.rowcount
 
-            raw_conn.commit()
             skipped = max(0, total - inserted)
             return {"inserted": inserted, "failed": 0, "skipped": skipped}
 
         except Exception as e:
-            raw_conn.rollback()
             logger.error(f"Erro ao inserir itens via COPY: {str(e)}")
             return {"inserted": 0, "failed": total if total else 1, "skipped": 0}
-        finally:
-            raw_conn.close()
 
     def load_items_from_file(
         self, file_path: Path, batch_size: int = 100000, use_copy: Optional[bool] = None
@@ -908,51 +1102,176 @@ class DataLoader:
         failed = 0
         skipped = 0
 
+        import pyarrow as pa
+        from pyarrow import csv as pacsv
+
+        # Cabeçalho lido e normalizado uma vez: os blocos já vêm só com as colunas
+        # necessárias, com os nomes normalizados e tipadas pelo parser
+        columns = pd.read_csv(file_path, nrows=0).columns.str.lower().str.strip()
+        missing = sorted(set(ITEM_COLUMNS) - set(columns))
+        if missing:
+            logger.error(f"Itens inválido: colunas ausentes {missing}")
+            rows = sum(len(c) for c in pd.read_csv(file_path, usecols=[0], chunksize=batch_size))
+            return {"inserted": 0, "failed": rows, "skipped": 0}
+
+        # Uma única sessão e transação para o mapa de produtos e todos os lotes; cada
+        # lote roda num savepoint, e um lote com erro não desfaz os demais
         with self.Session() as session:
-            produtos_db = session.query(Produto.id, Produto.nome).all()
-            produto_map = {p.nome: p.id for p in produtos_db}
-
-        for chunk in pd.read_csv(file_path, chunksize=batch_size):
-            chunk.columns = chunk.columns.str.lower().str.strip()
-            required = {"id_transacao", "produto", "quantidade", "valor_unitario", "valor_total"}
-            if not required.issubset(set(chunk.columns)):
-                missing = sorted(required - set(chunk.columns))
-                logger.error(f"Itens inválido: colunas ausentes {missing}")
-                failed += len(chunk)
-                continue
-
-            values = []
-            for row in chunk.to_dict("records"):
-                produto_id = produto_map.get(str(row.get("produto")).strip())
-                if not produto_id:
-                    skipped += 1
-                    continue
-                values.append(
-                    {
-                        "id_transacao": str(row.get("id_transacao")),
-                        "produto_id": produto_id,
-                        "quantidade": int(row.get("quantidade", 1)),
-                        "valor_unitario": Decimal(str(row.get("valor_unitario", 0))),
-                        "valor_total": Decimal(str(row.get("valor_total", 0))),
-                    }
+            if self._produto_map is None:
+                self._produto_map = dict(
+                    session.execute(text("SELECT nome, id FROM produtos")).all()
                 )
+            produto_map = self._produto_map
+
+            # Leitor em streaming do pyarrow (tokenização multithread, em C++); cada
+            # bloco lido é fatiado em lotes de até batch_size linhas
+            reader = pacsv.open_csv(
+                file_path,
+                read_options=pacsv.ReadOptions(
+                    column_names=list(columns), skip_rows=1, block_size=ITEM_CSV_BLOCK_SIZE
+                ),
+                convert_options=pacsv.ConvertOptions(
+                    include_columns=list(ITEM_COLUMNS),
+                    column_types={
+                        "id_transacao": pa.string(),
+                        "produto": pa.string(),
+                        "quantidade": pa.int64(),
+                        "valor_unitario": pa.float64(),
+                        "valor_total": pa.float64(),
+                    },
+                ),
+            )
+            chunks = (
+                batch.slice(start, batch_size).to_pandas()
+                for batch in reader
+                for start in range(0, batch.num_rows, batch_size)
+            )
+            for chunk in chunks:
+                # Conversão coluna a coluna; itens de produtos fora do catálogo são ignorados
+                produto_ids = chunk["produto"].astype(str).str.strip().map(produto_map)
+                encontrados = produto_ids.notna()
+                skipped += int((~encontrados).sum())
+                chunk = chunk[encontrados]
+                if chunk.empty:
+                    continue
 
-            if not values:
-                continue
+                # Tuplas na ordem do INSERT, sem um dicionário por linha
+                rows = list(
+                    zip(
+                        chunk["id_transacao"].astype(str).tolist(),
+                        produto_ids[encontrados].astype("int64").tolist(),
+                        chunk["quantidade"].fillna(1).astype("int64").tolist(),
+                        chunk["valor_unitario"].astype("float64").tolist(),
+                        chunk["valor_total"].astype("float64").tolist(),
+                    )
+                )
 
-            with self.Session() as session:
                 try:
-                    session.execute(insert(TransacaoItem).values(values))
-                    session.commit()
-                    inserted += len(values)
+                    with session.begin_nested():
+                        with session.connection().connection.cursor() as cursor:
+                            execute_values(
+                                cursor, TRANSACAO_ITEM_INSERT_SQL, rows, page_size=len(rows)
+                            )
+                    inserted += len(rows)
                 except Exception as e:
-                    session.rollback()
-                    failed += len(values)
+                    failed += len(rows)
                     logger.error(f"Erro ao inserir itens: {str(e)}")
 
+            try:
+                session.commit()
+            except Exception as e:
+                session.rollback()
+                failed += inserted
+                inserted = 0
+                logger.error(f"Erro ao confirmar itens: {str(e)}")
+
         return {"inserted": inserted, "failed": failed, "skipped": skipped}
 
 
+class _DataFrameCsvStream(io.TextIOBase):
+    """
+    Arquivo somente leitura que serializa um DataFrame em CSV sob demanda.
+
+    O ``copy_expert`` lê o objeto aos poucos; cada leitura que esgota o bloco
+    atual gera o CSV das próximas ``chunk_rows`` linhas. Assim o banco começa a
+    ingerir antes do fim da serialização e só um bloco de texto fica em memória.
+    """
+
+    def __init__(self, df: pd.DataFrame, chunk_rows: int, **to_csv_kwargs):
+        self._chunks = (df.iloc[i : i + chunk_rows] for i in range(0, len(df), chunk_rows))
+        self._to_csv_kwargs = to_csv_kwargs
+        self._buffer = ""
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: Optional[int] = -1) -> str:
+        while self._pos >= len(self._buffer):
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                return ""
+            self._buffer = chunk.to_csv(index=False, header=False, **self._to_csv_kwargs)
+            self._pos = 0
+
+        # Leituras curtas são válidas: devolve no máximo o restante do bloco atual
+        end = len(self._buffer) if size is None or size < 0 else self._pos + size
+        data = self._buffer[self._pos : end]
+        self._pos += len(data)
+        return data
+
+
+def _transacao_columns(df: pd.DataFrame) -> Dict[str, list]:
+    """
+    Converte as colunas de transações para tipos Python nativos, coluna a coluna.
+
+    Substitui a conversão célula a célula de ``df.to_dict("records")``: cada
+    coluna é convertida uma vez (texto, inteiros, float), valores ausentes
+    das colunas opcionais viram None e textos repetidos (cliente, produto,
+    categoria, status, arquivo) compartilham o mesmo objeto str. O valor vai
+    como float: o driver o envia no repr mais curto e o banco arredonda para
+    NUMERIC(15, 2), o mesmo resultado de ``Decimal(str(valor))``.
+
+    Args:
+        df: DataFrame transformado.
+
+    Returns:
+        Dicionário coluna -> lista de valores, na ordem de TRANSACAO_COLUMNS.
+    """
+
+    def column(name: str, default=None) -> pd.Series:
+        if name in df.columns:
+            return df[name]
+        return pd.Series(default, index=df.index, dtype=object)
+
+    def optional(name: str) -> list:
+        series = column(name).astype(object)
+        return series.where(series.notna(), None).tolist()
+
+    def shared(name: str, default=None) -> list:
+        # Baixa cardinalidade: um único objeto str por valor distinto, reaproveitado em
+        # todas as linhas; o código -1 (ausente) cai no "nan" final, como no astype(str)
+        categorical = column(name, default).astype("category")
+        categories = categorical.cat.categories.astype(str).tolist() + ["nan"]
+        return [categories[code] for code in categorical.cat.codes.tolist()]
+
+    return {
+        "id_transacao": column("id_transacao").astype(str).tolist(),
+        "data_transacao": column("data_transacao").tolist(),
+        "cliente": shared("cliente"),
+        "produto": shared("produto"),
+        "categoria": shared("categoria"),
+        "valor": column("valor", 0).astype("float64").tolist(),
+        "status_pagamento": shared("status_pagamento"),
+        "data_pagamento": optional("data_pagamento"),
+        "ano_transacao": column("ano_transacao", 0).astype("int64").tolist(),
+        "mes_transacao": column("mes_transacao", 0).astype("int64").tolist(),
+        "dia_semana": optional("dia_semana"),
+        "trimestre": optional("trimestre"),
+        "arquivo_origem": shared("arquivo_origem", ""),
+    }
+
+
 def load(
     df: pd.DataFrame, file_name: str, file_path: str, file_hash: str, file_size: int = 0
 ) -> LoadResult:
@@ -336,6 +336,8 @@ class ETLPipeline:
             if not stats["success"]:
                 logger.error(f"Arquivo {file.name} falhou: {stats['error']}")
 
+        self.extractor.save_hash_cache()
+
         # =====================================================================
         # RESUMO FINAL
         # =====================================================================
@@ -350,6 +352,13 @@ class ETLPipeline:
         )
         total_loaded = sum((r.get("load") or {}).get("inserted", 0) for r in results)
 
+        # Views da API criadas sempre que faltarem (mesmo sem carga nova); o
+        # refresh das pré-agregações só acontece quando houve carga nova
+        if total_loaded > 0:
+            self.loader.refresh_materialized_views()
+        else:
+            self.loader.ensure_materialized_views()
+
         logger.info("")
         logger.info("=" * 60)
         logger.info("📊 RESUMO DO PIPELINE")
@@ -20,7 +20,9 @@ from sqlalchemy import (
     Boolean,
     BigInteger,
     CheckConstraint,
+    Computed,
     DateTime,
+    Float,
     ForeignKey,
     Index,
     Integer,
@@ -30,6 +32,8 @@ from sqlalchemy import (
     create_engine,
     text,
 )
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
 # Adiciona o diretório raiz ao path para importar config
@@ -37,6 +41,10 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from config.settings import get_settings
 
+# Materialized views da API (sql/materialized_views.sql), atualizadas ao final do ETL
+MATERIALIZED_VIEWS = ("mv_agregado", "mv_filtros")
+MATERIALIZED_VIEWS_SQL = Path(__file__).parent.parent / "sql" / "materialized_views.sql"
+
 
 class Base(DeclarativeBase):
     """Classe base para todos os modelos SQLAlchemy."""
@@ -90,6 +98,32 @@ class Transacao(Base):
         server_default=text("CURRENT_TIMESTAMP"),
     )
 
+    # Prazos em dias calculados pelo banco na gravação (usados nas métricas da API)
+    dias_processamento: Mapped[Optional[float]] = mapped_column(
+        Float,
+        Computed(
+            "EXTRACT(EPOCH FROM (data_processamento - data_transacao)) / 86400.0",
+            persisted=True,
+        ),
+    )
+    dias_pagamento: Mapped[Optional[float]] = mapped_column(
+        Float,
+        Computed(
+            "EXTRACT(EPOCH FROM (data_pagamento - data_transacao)) / 86400.0",
+            persisted=True,
+        ),
+    )
+
+    # Documento de busca textual (filtro "busca" da API)
+    search_doc: Mapped[Optional[str]] = mapped_column(
+        TSVECTOR,
+        Computed(
+            "to_tsvector('simple', coalesce(cliente, '') || ' ' || coalesce(produto, '') "
+            "|| ' ' || coalesce(categoria, ''))",
+            persisted=True,
+        ),
+    )
+
     # Constraints
     __table_args__ = (
         UniqueConstraint("id_transacao", name="uk_transacao_id"),
@@ -124,6 +158,21 @@ class Transacao(Base):
             "data_transacao",
         ),
         Index("idx_transacoes_id_transacao", "id_transacao"),
+        # Cobre os filtros de _build_filters + ORDER BY data_transacao DESC (varredura
+        # reversa do btree) e as somas de valor sem acessar o heap
+        Index(
+            "idx_transacoes_filtros_data",
+            "ano_transacao",
+            "mes_transacao",
+            "categoria",
+            "status_pagamento",
+            "produto",
+            "data_transacao",
+            postgresql_include=["valor"],
+        ),
+        # Paginação por cursor: ORDER BY data_transacao DESC, id DESC
+        Index("idx_transacoes_data_id", "data_transacao", "id"),
+        Index("idx_transacoes_search_doc", "search_doc", postgresql_using="gin"),
     )
 
     def __repr__(self) -> str:
@@ -238,7 +287,8 @@ class ArquivoProcessado(Base):
 
     # Constraints
     __table_args__ = (
-        Index("idx_arquivos_hash", "hash_arquivo"),
+        # Cobre o filtro (hash_arquivo, status) da verificação de arquivo já processado
+        Index("idx_arquivos_hash_status", "hash_arquivo", "status"),
         Index("idx_arquivos_nome", "nome_arquivo"),
     )
 
@@ -325,6 +375,56 @@ def get_engine():
     )
 
 
+def get_async_engine() -> AsyncEngine:
+    """
+    Cria e retorna o engine assíncrono (asyncpg) usado pela API.
+
+    O asyncpg já trafega os resultados no protocolo binário do PostgreSQL
+    (int4, float8, timestamp sem conversão texto), por isso as leituras da
+    API não passam pelo psycopg2. O engine síncrono continua em psycopg2
+    por causa do COPY (copy_expert) usado na carga.
+
+    Returns:
+        AsyncEngine: Objeto de conexão SQLAlchemy assíncrono.
+    """
+    settings = get_settings()
+    return create_async_engine(
+        settings.database_url_async,
+        echo=settings.etl_log_level == "DEBUG",
+        pool_pre_ping=True,
+        pool_size=20,
+        max_overflow=10,
+        # Reaproveita prepared statements do asyncpg entre requisições com o mesmo SQL
+        connect_args={"prepared_statement_cache_size": 500},
+    )
+
+
+def create_materialized_views(engine) -> bool:
+    """
+    Cria as materialized views da API que ainda não existam.
+
+    Executa sql/materialized_views.sql (idempotente) só quando falta alguma das
+    MATERIALIZED_VIEWS; as tabelas precisam existir antes.
+
+    Args:
+        engine: Engine SQLAlchemy síncrono.
+
+    Returns:
+        True se alguma view foi criada.
+    """
+    with engine.begin() as conn:
+        existentes = set(
+            conn.execute(
+                text("SELECT matviewname FROM pg_matviews WHERE matviewname = ANY(:nomes)"),
+                {"nomes": list(MATERIALIZED_VIEWS)},
+            ).scalars()
+        )
+        if existentes == set(MATERIALIZED_VIEWS):
+            return False
+        conn.exec_driver_sql(MATERIALIZED_VIEWS_SQL.read_text(encoding="utf-8"))
+    return True
+
+
 def create_tables():
     """
     Cria todas as tabelas no banco de dados.
@@ -333,6 +433,7 @@ def create_tables():
     """
     engine = get_engine()
     Base.metadata.create_all(engine)
+    create_materialized_views(engine)
     print("Tabelas criadas com sucesso!")
 
 
@@ -60,14 +60,16 @@ def create_database():
 
 
 def create_tables():
-    """Cria as tabelas usando SQLAlchemy."""
-    from scripts.models import Base, get_engine
+    """Cria as tabelas (SQLAlchemy) e as materialized views da API."""
+    from scripts.models import Base, create_materialized_views, get_engine
 
     logger.info("Criando tabelas...")
 
     try:
         engine = get_engine()
         Base.metadata.create_all(engine)
+        if create_materialized_views(engine):
+            logger.info("Materialized views da API criadas")
         logger.success("Tabelas criadas com sucesso!")
         return True
     except Exception as e:
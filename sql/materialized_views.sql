@@ -0,0 +1,58 @@
+-- =============================================================================
+-- ETL Pipeline - Materialized views da API
+-- =============================================================================
+-- Pré-agregações consultadas por /filtros e /agregados/* no lugar de varrer
+-- a tabela transacoes a cada requisição. São atualizadas ao final do ETL
+-- (DataLoader.refresh_materialized_views).
+-- Uso: psql -d etl_portfolio -f sql/materialized_views.sql
+-- =============================================================================
+
+-- -----------------------------------------------------------------------------
+-- MATERIALIZED VIEW: mv_agregado
+-- -----------------------------------------------------------------------------
+-- Rollup por período, categoria, produto, status e dia da semana.
+-- Os endpoints aplicam os filtros e somam quantidade/valor sobre este rollup.
+-- -----------------------------------------------------------------------------
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS mv_agregado AS
+SELECT
+    ano_transacao,
+    mes_transacao,
+    categoria,
+    produto,
+    status_pagamento,
+    dia_semana,
+    COUNT(*) AS quantidade,
+    SUM(valor) AS valor
+FROM transacoes
+GROUP BY ano_transacao, mes_transacao, categoria, produto, status_pagamento, dia_semana;
+
+-- Índice único exigido pelo REFRESH ... CONCURRENTLY
+CREATE UNIQUE INDEX IF NOT EXISTS uk_mv_agregado
+    ON mv_agregado(ano_transacao, mes_transacao, categoria, produto, status_pagamento, dia_semana);
+CREATE INDEX IF NOT EXISTS idx_mv_agregado_categoria ON mv_agregado(categoria);
+CREATE INDEX IF NOT EXISTS idx_mv_agregado_produto ON mv_agregado(produto);
+CREATE INDEX IF NOT EXISTS idx_mv_agregado_status ON mv_agregado(status_pagamento);
+
+COMMENT ON MATERIALIZED VIEW mv_agregado IS 'Rollup de transações para os endpoints /agregados/*';
+
+
+-- -----------------------------------------------------------------------------
+-- MATERIALIZED VIEW: mv_filtros
+-- -----------------------------------------------------------------------------
+-- Combinações distintas das dimensões usadas nas listas de /filtros.
+-- -----------------------------------------------------------------------------
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS mv_filtros AS
+SELECT DISTINCT
+    ano_transacao,
+    mes_transacao,
+    categoria,
+    status_pagamento,
+    produto
+FROM transacoes;
+
+CREATE UNIQUE INDEX IF NOT EXISTS uk_mv_filtros
+    ON mv_filtros(ano_transacao, mes_transacao, categoria, status_pagamento, produto);
+
+COMMENT ON MATERIALIZED VIEW mv_filtros IS 'Valores distintos das dimensões para /filtros';
@@ -7,4 +7,39 @@
 
 CREATE INDEX IF NOT EXISTS idx_transacoes_produto ON transacoes(produto);
 
+-- Verificação de arquivo já processado (hash_arquivo + status) só no índice;
+-- substitui o índice apenas por hash_arquivo, que vira prefixo redundante
+CREATE INDEX IF NOT EXISTS idx_arquivos_hash_status ON arquivos_processados(hash_arquivo, status);
+DROP INDEX IF EXISTS idx_arquivos_hash;
+
+-- Prazos em dias pré-calculados para as métricas (evita EXTRACT por linha na API)
+ALTER TABLE transacoes
+    ADD COLUMN IF NOT EXISTS dias_processamento DOUBLE PRECISION GENERATED ALWAYS AS (
+        EXTRACT(EPOCH FROM (data_processamento - data_transacao)) / 86400.0
+    ) STORED,
+    ADD COLUMN IF NOT EXISTS dias_pagamento DOUBLE PRECISION GENERATED ALWAYS AS (
+        EXTRACT(EPOCH FROM (data_pagamento - data_transacao)) / 86400.0
+    ) STORED;
+
+-- Filtros da API (ano, mes, categoria, status, produto) + ORDER BY data_transacao DESC.
+-- INCLUDE (valor) permite index-only scan nas somas.
+CREATE INDEX IF NOT EXISTS idx_transacoes_filtros_data
+    ON transacoes(ano_transacao, mes_transacao, categoria, status_pagamento, produto, data_transacao)
+    INCLUDE (valor);
+
+-- Paginação por cursor (keyset) em /transacoes: ORDER BY data_transacao DESC, id DESC
+CREATE INDEX IF NOT EXISTS idx_transacoes_data_id ON transacoes(data_transacao, id);
+
+-- Busca textual full-text (search_doc @@ to_tsquery) usada por padrão na API
+ALTER TABLE transacoes
+    ADD COLUMN IF NOT EXISTS search_doc TSVECTOR GENERATED ALWAYS AS (
+        to_tsvector('simple', coalesce(cliente, '') || ' ' || coalesce(produto, '') || ' ' || coalesce(categoria, ''))
+    ) STORED;
+CREATE INDEX IF NOT EXISTS idx_transacoes_search_doc ON transacoes USING gin (search_doc);
+
+-- Busca textual via ILIKE '%termo%' (API_BUSCA_FULLTEXT=false)
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE INDEX IF NOT EXISTS idx_transacoes_busca_trgm
+    ON transacoes USING gin (cliente gin_trgm_ops, produto gin_trgm_ops, categoria gin_trgm_ops);
+
 ANALYZE transacoes;
@@ -99,6 +99,19 @@ CREATE TABLE transacoes (
     arquivo_origem      VARCHAR(255) NOT NULL,
     data_processamento  TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
 
+    -- Prazos em dias (colunas geradas, usadas nas métricas da API)
+    dias_processamento  DOUBLE PRECISION GENERATED ALWAYS AS (
+        EXTRACT(EPOCH FROM (data_processamento - data_transacao)) / 86400.0
+    ) STORED,
+    dias_pagamento      DOUBLE PRECISION GENERATED ALWAYS AS (
+        EXTRACT(EPOCH FROM (data_pagamento - data_transacao)) / 86400.0
+    ) STORED,
+
+    -- Documento de busca textual (filtro "busca" da API)
+    search_doc          TSVECTOR GENERATED ALWAYS AS (
+        to_tsvector('simple', coalesce(cliente, '') || ' ' || coalesce(produto, '') || ' ' || coalesce(categoria, ''))
+    ) STORED,
+
     -- Constraint para evitar duplicatas
     CONSTRAINT uk_transacao_id UNIQUE (id_transacao)
 );
@@ -114,6 +127,9 @@ CREATE INDEX idx_transacoes_ano_mes_data ON transacoes(ano_transacao, mes_transa
 CREATE INDEX idx_transacoes_ano_mes_categoria_data ON transacoes(ano_transacao, mes_transacao, categoria, data_transacao);
 CREATE INDEX idx_transacoes_ano_mes_status_data ON transacoes(ano_transacao, mes_transacao, status_pagamento, data_transacao);
 CREATE INDEX idx_transacoes_id_transacao ON transacoes(id_transacao);
+CREATE INDEX idx_transacoes_filtros_data ON transacoes(ano_transacao, mes_transacao, categoria, status_pagamento, produto, data_transacao) INCLUDE (valor);
+CREATE INDEX idx_transacoes_data_id ON transacoes(data_transacao, id);
+CREATE INDEX idx_transacoes_search_doc ON transacoes USING gin (search_doc);
 
 -- Comentários na tabela e colunas
 COMMENT ON TABLE transacoes IS 'Tabela principal de transações financeiras processadas pelo ETL';
@@ -215,7 +231,7 @@ CREATE TABLE arquivos_processados (
     id_log_etl          INTEGER REFERENCES logs_etl(id_log)
 );
 
-CREATE INDEX idx_arquivos_hash ON arquivos_processados(hash_arquivo);
+CREATE INDEX idx_arquivos_hash_status ON arquivos_processados(hash_arquivo, status);
 CREATE INDEX idx_arquivos_nome ON arquivos_processados(nome_arquivo);
 
 COMMENT ON TABLE arquivos_processados IS 'Controle de arquivos já processados para evitar duplicação';
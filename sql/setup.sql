@@ -6,3 +6,4 @@
 
 \i sql/schema.sql
 \i sql/views_powerbi.sql
+\i sql/materialized_views.sql
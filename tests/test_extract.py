@@ -0,0 +1,60 @@
+"""
+Testes da extração de CSV (leitor pyarrow x pandas).
+"""
+
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from scripts.extract import DataExtractor
+from scripts.transform import DataTransformer
+
+# Linhas com campos críticos em branco (id_transacao) e opcionais vazios
+CSV_CAMPOS_EM_BRANCO = (
+    "id_transacao;data_transacao;cliente;produto;categoria;valor;status_pagamento;"
+    "data_pagamento\n"
+    "TRX-1;02/01/2024;José;Mouse;Periféricos;10,50;pago;03/01/2024\n"
+    ";04/01/2024;Ana;Mouse;Periféricos;20;pendente;\n"
+    ";05/01/2024;Bia;Teclado;Periféricos;30;pendente;\n"
+    "TRX-4;06/01/2024;;Teclado;;40;pendente;\n"
+)
+
+
+def _extrair_e_transformar(file_path) -> pd.DataFrame:
+    extractor = DataExtractor(raw_data_path=file_path.parent)
+    result = extractor.extract_file(file_path)
+    assert result.success, result.error_message
+    return DataTransformer().transform(result.dataframe).dataframe
+
+
+@pytest.mark.parametrize("encoding", ["latin-1", "utf-8-sig"])
+def test_csv_arrow_trata_campos_vazios_como_pandas(tmp_path, monkeypatch, encoding):
+    """Campos vazios lidos pelo pyarrow viram nulos, como no pd.read_csv."""
+    file_path = tmp_path / "transacoes.csv"
+    file_path.write_bytes(CSV_CAMPOS_EM_BRANCO.encode(encoding))
+
+    via_arrow = _extrair_e_transformar(file_path)
+
+    # Força o fallback para o engine C do pandas
+    def _arrow_indisponivel(*args, **kwargs):
+        raise pa.ArrowInvalid("forçando leitura via pandas")
+
+    monkeypatch.setattr(DataExtractor, "_read_csv_arrow", _arrow_indisponivel)
+    via_pandas = _extrair_e_transformar(file_path)
+
+    assert via_arrow["id_transacao"].tolist() == ["TRX-1", "TRX-4"]
+    pd.testing.assert_frame_equal(via_arrow, via_pandas, check_dtype=False, check_categorical=False)
+
+
+def test_csv_em_blocos_trata_campos_vazios_como_nulos(tmp_path):
+    """O leitor em blocos também entrega campos vazios como nulos, não como ""."""
+    file_path = tmp_path / "transacoes.csv"
+    file_path.write_bytes(CSV_CAMPOS_EM_BRANCO.encode("utf-8"))
+
+    result = DataExtractor(raw_data_path=tmp_path).extract_file_chunks(file_path)
+    assert result.success, result.error_message
+    df = pd.concat(list(result.dataframe_iter), ignore_index=True)
+
+    assert df["id_transacao"].isna().tolist() == [False, True, True, False]
+    assert df["data_pagamento"].isna().tolist() == [False, True, True, True]
+    assert not (df[["id_transacao", "cliente", "categoria"]] == "").any().any()